@@ -0,0 +1,109 @@
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holepunch.fold import Fold, DiagonalFold, HorizontalFold, VerticalFold
+from holepunch.fold_cache import FoldCache
+from holepunch.generator import ALL_FOLDS, PuzzleGenerator
+from holepunch.paper import Paper
+from holepunch.point import Point
+
+ORACLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "oracle_4x4.json")
+
+def halving_folds(size: int, depth: int) -> list[Fold] | None:
+    # Alternating vertical and horizontal folds that each lay the smaller half of the current
+    # footprint over the larger one, or None if the sheet runs out of room before `depth` folds
+    low, high = [0, 0], [size - 1, size - 1]
+    folds = []
+    for step in range(depth):
+        axis = step % 2
+        if high[axis] == low[axis]:
+            return None
+        line = low[axis] + (high[axis] - low[axis] + 1) // 2 - 0.5
+        folds.append(VerticalFold(line, left_fold=False) if axis == 0 else HorizontalFold(line, downward=False))
+        low[axis] = int(line + 0.5)
+    return folds
+
+def single_fold(size: int, kind: str) -> Fold:
+    middle = size // 2 - 0.5
+    if kind == "horizontal":
+        return HorizontalFold(middle, downward=False)
+    elif kind == "vertical":
+        return VerticalFold(middle, left_fold=False)
+    elif kind == "diagonal":
+        return DiagonalFold(Point(0, 0), Point(size - 1, size - 1), left_fold=True)
+    raise ValueError(f"Unknown fold kind {kind!r}")
+
+def folded_paper(size: int, folds: list[Fold], punches: list[Point] = (), cache: FoldCache | None = None) -> Paper:
+    paper = Paper(size, cache)
+    for fold in folds:
+        paper.add_fold(fold)
+    for point in punches:
+        paper.punch(point)
+    return paper
+
+def oracle_paper(sequence: list[int], punches: list[tuple[int, int]]) -> Paper:
+    # The 4x4 paper of an oracle case, folded and punched
+    return folded_paper(4, [ALL_FOLDS[index] for index in sequence], [Point(x, y) for x, y in punches])
+
+def random_folds(paper: Paper, count: int, rng: random.Random) -> list[Fold]:
+    # Folds the paper by up to `count` random valid folds of ALL_FOLDS and returns them
+    folds = []
+    for _ in range(count):
+        valid = [fold for fold in ALL_FOLDS if paper.check_fold_is_valid(fold)]
+        if not valid:
+            break
+        folds.append(rng.choice(valid))
+        paper.add_fold(folds[-1])
+    return folds
+
+def oracle_cases() -> list[tuple[list[int], list[tuple[int, int]]]]:
+    # Canonical 4x4 cases: every fold of ALL_FOLDS on its own, then seeded valid sequences of 2 to 4
+    # folds, each with the punches taken at the end
+    cases = [([index], [(1, 1), (2, 2)]) for index in range(len(ALL_FOLDS))]
+    generator = PuzzleGenerator()
+    rng = random.Random(2024)
+    while len(cases) < len(ALL_FOLDS) + 60:
+        sequence: tuple[int, ...] = ()
+        for _ in range(rng.randint(2, 4)):
+            next_folds = generator.valid_next_folds(sequence)
+            if not next_folds:
+                break
+            sequence = (*sequence, rng.choice(next_folds))
+        punch_points = generator.punch_points(generator.paper_for(sequence))
+        punches = rng.sample(punch_points, min(2, len(punch_points)))
+        cases.append((list(sequence), [(point.x, point.y) for point in punches]))
+    return cases
+
+def snapshot(sequence: list[int], punches: list[tuple[int, int]]) -> dict:
+    paper = folded_paper(4, [ALL_FOLDS[index] for index in sequence])
+    points = [Point(x, y) for x, y in punches]
+    unfolded = paper.unfold(points)
+    for point in points:
+        paper.punch(point)
+    steps = []
+    for fold_index in range(len(sequence) + 1):
+        cells = paper.get_cells_at_fold(fold_index)
+        steps.append({
+            "cells": sorted(
+                [point.x, point.y, is_punched, str(representation.orientation), representation.is_halved, representation.z_indexes]
+                for point, representations in cells.items()
+                for is_punched, representation in representations
+            ),
+            "visible": sorted([cell.origin.x, cell.origin.y] for cell in paper.get_visible_cells(fold_index)),
+            "outline": [[list(vertex) for vertex in loop] for loop in paper.get_outline(fold_index)],
+        })
+    return {
+        "folds": sequence,
+        "punches": [list(punch) for punch in punches],
+        "steps": steps,
+        "holes": [[[hole.x, hole.y] for hole in holes] for holes in unfolded],
+    }
+
+if __name__ == "__main__":
+    # Regenerates the oracle from the current Paper, only do this for intended behaviour changes
+    with open(ORACLE_PATH, "w") as oracle_file:
+        json.dump([snapshot(sequence, punches) for sequence, punches in oracle_cases()], oracle_file)
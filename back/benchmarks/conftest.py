@@ -0,0 +1,28 @@
+# Benchmarks for the fold, punch, unfold and render hot paths, plus correctness oracles.
+#
+#   python -m pytest benchmarks                                  # run and print timings
+#   python -m pytest benchmarks --benchmark-autosave             # save a JSON baseline to .benchmarks/
+#   python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+#
+# Every benchmark also stores its tracemalloc peak and retained bytes in extra_info, so allocations
+# end up in the saved baselines next to the timings.
+import os
+import sys
+import tracemalloc
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def track_allocations(benchmark):
+    def track(function, *args):
+        tracemalloc.start()
+        try:
+            result = function(*args)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["retained_bytes"] = current
+        benchmark.extra_info["peak_bytes"] = peak
+        return result
+    return track
@@ -0,0 +1,102 @@
+# Load test for the HTTP/JSON solver service: concurrent keep-alive clients each send batches of
+# puzzles sampled the way the question bank builds them. Starts a service in-process unless --port
+# points at a running one.
+#
+#   python benchmarks/load_test.py --clients 32 --requests 50 --batch 20
+#   python benchmarks/load_test.py --port 8765 --clients 64
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holepunch.generator import PuzzleGenerator
+from holepunch.service import SolverService
+
+class Client:
+    # One keep-alive HTTP/1.1 connection
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> 'Client':
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in head[1:] if line)}
+        return int(head[0].split(" ")[1]), json.loads(await self.reader.readexactly(int(headers["content-length"])))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+def sample_puzzles(count: int, seed: int) -> list[dict]:
+    generator = PuzzleGenerator()
+    rng = random.Random(seed)
+    return [
+        {"folds": list(puzzle.folds), "punches": [[puzzle.punch.x, puzzle.punch.y]]}
+        for puzzle in generator.sample(count, rng=rng, unique=False)
+    ]
+
+async def run_client(host: str, port: int, puzzles: list[dict], requests: int, batch: int, rng: random.Random) -> list[float]:
+    client = await Client.connect(host, port)
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            status, _ = await client.request("POST", "/solve", {"puzzles": rng.sample(puzzles, batch)})
+            if status != 200:
+                raise RuntimeError(f"Service answered {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.close()
+    return latencies
+
+async def load_test(host: str, port: int | None, clients: int, requests: int, batch: int, distinct: int, seed: int):
+    service = None
+    if port is None:
+        service = SolverService()
+        server = await service.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    puzzles = sample_puzzles(distinct, seed)
+    start = time.perf_counter()
+    latencies = sorted(sum(await asyncio.gather(*(
+        run_client(host, port, puzzles, requests, batch, random.Random(f"{seed}:{client}")) for client in range(clients)
+    )), []))
+    elapsed = time.perf_counter() - start
+
+    total = clients * requests
+    print(f"{total} requests of {batch} puzzles over {clients} connections in {elapsed:.2f}s")
+    print(f"{total / elapsed:.0f} requests/sec, {total * batch / elapsed:.0f} puzzles/sec")
+    print(f"latency p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+    stats_client = await Client.connect(host, port)
+    print("stats", (await stats_client.request("GET", "/stats"))[1])
+    await stats_client.close()
+    if service is not None:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the solver service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port of a running service, one is started otherwise")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--batch", type=int, default=20, help="Puzzles per request")
+    parser.add_argument("--distinct", type=int, default=2000, help="Distinct puzzles the batches are drawn from")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.batch, args.distinct, args.seed))
+
+if __name__ == "__main__":
+    main()
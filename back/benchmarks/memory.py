@@ -0,0 +1,109 @@
+# Per-cell memory of a 64x64 sheet after 6 folds.
+#
+# "object graph" is the history the way Paper used to hold it: one Cell per grid cell, each with a
+# locations list of CellRepresentation objects, with the slotted CellRepresentation and interned
+# Point. "unslotted graph" is the same graph built from copies of the classes as they were before
+# __slots__ and interning, with a Point of its own per location. "fold engine" is what Paper holds
+# now: the FoldHistory of its FoldEngine, step 0 in full and then only the cells each fold changed,
+# plus its sorted index of positions, built on the first lookup after a fold.
+#
+#   python benchmarks/memory.py
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holepunch.cell import Cell, CellRepresentation
+from holepunch.fold import DiagonalFold, HorizontalFold, VerticalFold
+from holepunch.paper import Paper
+from holepunch.point import Point
+
+SIZE = 64
+FOLDS = [
+    VerticalFold(31.5),
+    HorizontalFold(31.5),
+    VerticalFold(15.5),
+    HorizontalFold(15.5),
+    DiagonalFold(Point(0, 0), Point(15, 15)),
+    VerticalFold(7.5),
+]
+
+
+def measure(build) -> tuple[object, int, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def build_paper() -> Paper:
+    paper = Paper(SIZE)
+    for fold in FOLDS:
+        paper.add_fold(fold)
+    return paper
+
+
+class UnslottedPoint:
+    # Point before interning and __slots__
+    def __init__(self, x: int, y: int):
+        self.x: int = int(x)
+        self.y: int = int(y)
+
+
+class UnslottedCellRepresentation:
+    # CellRepresentation before __slots__
+    def __init__(self, point: UnslottedPoint, orientation, is_halved: bool, z_index):
+        self.point = point
+        self.orientation = orientation
+        self.is_halved = is_halved
+        self._z_index = z_index
+
+
+def build_object_graph(paper: Paper) -> list[Cell]:
+    cells = []
+    for view in paper.cells.values():
+        cell = Cell(view.origin)
+        cell.locations = view.locations
+        cells.append(cell)
+    return cells
+
+
+def build_unslotted_graph(paper: Paper) -> list[Cell]:
+    cells = []
+    for view in paper.cells.values():
+        cell = Cell(view.origin)
+        cell.locations = [
+            UnslottedCellRepresentation(
+                UnslottedPoint(location.point.x, location.point.y),
+                location.orientation,
+                location.is_halved,
+                list(location._z_index) if isinstance(location._z_index, list) else location._z_index,
+            )
+            for location in view.locations
+        ]
+        cells.append(cell)
+    return cells
+
+
+def report(name: str, current: int, peak: int, cell_count: int):
+    print(f"{name:<16} {current / cell_count:>10.1f} B/cell retained {peak / cell_count:>10.1f} B/cell peak")
+
+
+if __name__ == "__main__":
+    cell_count = SIZE * SIZE
+    print(f"{SIZE}x{SIZE} sheet, {len(FOLDS)} folds, {cell_count} cells")
+    print(f"sizeof Point              {sys.getsizeof(Point(0, 0))} B")
+    print(f"sizeof CellRepresentation {sys.getsizeof(CellRepresentation(Point(0, 0)))} B")
+
+    paper, current, peak = measure(build_paper)
+    report("fold engine", current, peak, cell_count)
+
+    _, current, peak = measure(lambda: build_object_graph(paper))
+    report("object graph", current, peak, cell_count)
+
+    _, current, peak = measure(lambda: build_unslotted_graph(paper))
+    report("unslotted graph", current, peak, cell_count)
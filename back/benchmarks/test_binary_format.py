@@ -0,0 +1,57 @@
+import pytest
+from cases import oracle_cases, oracle_paper
+from holepunch.binary_format import BankFile, PaperRecord, encode_paper, write_bank
+from holepunch.point import Point
+
+@pytest.mark.parametrize("include_state", [False, True])
+def test_bank_round_trip(tmp_path, include_state):
+    cases = oracle_cases()
+    path = str(tmp_path / "bank.hpb")
+    assert write_bank(path, (oracle_paper(*case) for case in cases), include_state=include_state) == len(cases)
+    with BankFile(path) as bank:
+        assert len(bank) == len(cases)
+        for (sequence, punches), record in zip(cases, bank):
+            original, loaded = oracle_paper(sequence, punches), record.paper()
+            assert [fold.signature for fold in loaded.folds] == [fold.signature for fold in original.folds]
+            assert loaded.punches == original.punches
+            assert record.holes == original.unfold(original.punches)
+            assert loaded.state_hash() == original.state_hash()
+            assert loaded.engine.stacks == original.engine.stacks
+            for step in range(len(sequence) + 1):
+                loaded_state, original_state = loaded.engine.history.state_at(step), original.engine.history.state_at(step)
+                assert all((a == b).all() and a.dtype == b.dtype for a, b in zip(loaded_state, original_state))
+
+def test_random_access(tmp_path, benchmark):
+    path = str(tmp_path / "bank.hpb")
+    cases = oracle_cases()
+    write_bank(path, (oracle_paper(*case) for case in cases))
+    with BankFile(path) as bank:
+        assert bank[-1].holes == bank[len(cases) - 1].holes
+        with pytest.raises(IndexError):
+            bank[len(cases)]
+        assert benchmark(lambda: bank[len(cases) // 2].holes) == oracle_paper(*cases[len(cases) // 2]).unfold(
+            [Point(x, y) for x, y in cases[len(cases) // 2][1]])
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-bank.hpb"
+    path.write_bytes(b"{}" * 32)
+    with pytest.raises(ValueError):
+        BankFile(str(path))
+
+def test_folds_take_a_few_bytes():
+    # Horizontal and vertical folds take 3 bytes, diagonal folds 9
+    short, long = encode_paper(oracle_paper([1], [])), encode_paper(oracle_paper([1, 7, 3, 26], []))
+    assert PaperRecord(short).buffer[6:8].tobytes() == (3).to_bytes(2, "little")
+    assert PaperRecord(long).buffer[6:8].tobytes() == (18).to_bytes(2, "little")
+
+def test_records_outlive_the_bank(tmp_path):
+    path = str(tmp_path / "bank.hpb")
+    sequence, punches = oracle_cases()[0]
+    write_bank(path, [oracle_paper(sequence, punches)], include_state=True)
+    with BankFile(path) as bank:
+        record = bank[0]
+        layers = record.state(len(sequence)).layer
+    assert record.holes == oracle_paper(sequence, punches).unfold(oracle_paper(sequence, punches).punches)
+    assert (layers == oracle_paper(sequence, punches).engine.history.state_at(len(sequence)).layer).all()
+    with pytest.raises(ValueError):
+        bank[0]
@@ -0,0 +1,20 @@
+import json
+import pytest
+from holepunch.__main__ import main
+
+def test_prints_unfolded_holes(capsys):
+    main(["--fold", "1", "--punch", "3,3"])
+    assert all(isinstance(json.loads(line), list) for line in capsys.readouterr().out.splitlines())
+
+@pytest.mark.parametrize("argv", [
+    ["--size", "0", "--punch", "0,0"],
+    ["--fold", '{"type": "vertical", "line": [1]}', "--punch", "0,0"],
+    ["--fold", '{"type": "horizontal"}', "--punch", "0,0"],
+    ["--fold", "99", "--punch", "0,0"],
+    ["--punch", "0"],
+])
+def test_bad_input_is_a_usage_error(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
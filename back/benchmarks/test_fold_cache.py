@@ -0,0 +1,94 @@
+import random
+import pytest
+from cases import folded_paper, random_folds
+from holepunch import fold_trace, profiling
+from holepunch.fold_cache import FoldCache
+from holepunch.generator import ALL_FOLDS
+from holepunch.paper import Paper
+
+def observe(paper: Paper) -> tuple:
+    state = paper.engine.history.current
+    return [field.tolist() for field in state], dict(paper.engine.stacks), paper.state_hash()
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hits_match_misses(seed):
+    folds = random_folds(Paper(), 4, random.Random(seed))
+    cache = FoldCache()
+    missed = folded_paper(4, folds, cache=cache)
+    assert cache.hits == 0 and cache.misses == len(folds)
+    hit = folded_paper(4, folds, cache=cache)
+    assert cache.hits == len(folds)
+    uncached = folded_paper(4, folds, cache=None)
+    # A state hash computed from scratch equals the one carried over from the cache
+    uncached.state_hash()
+    assert observe(hit) == observe(missed) == observe(uncached)
+    for step in range(len(folds) + 1):
+        assert all((a == b).all() for a, b in zip(hit.engine.history.state_at(step), uncached.engine.history.state_at(step)))
+
+def test_evicts_least_recently_used():
+    cache = FoldCache(max_size=2)
+    folded_paper(4, [ALL_FOLDS[0]], cache=cache)
+    folded_paper(4, [ALL_FOLDS[1]], cache=cache)
+    folded_paper(4, [ALL_FOLDS[0]], cache=cache)
+    folded_paper(4, [ALL_FOLDS[2]], cache=cache)
+    assert len(cache) == 2
+    hits = cache.hits
+    folded_paper(4, [ALL_FOLDS[0]], cache=cache)
+    assert cache.hits == hits + 1
+    folded_paper(4, [ALL_FOLDS[1]], cache=cache)
+    assert cache.hits == hits + 1
+    with pytest.raises(ValueError):
+        FoldCache(max_size=0)
+
+def test_tracing_bypasses_the_cache():
+    folds = random_folds(Paper(), 4, random.Random(0))
+    with fold_trace.tracing() as uncached_events:
+        folded_paper(4, folds, cache=None)
+    cache = FoldCache()
+    folded_paper(4, folds, cache=cache)
+    with fold_trace.tracing() as cached_events:
+        folded_paper(4, folds, cache=cache)
+    assert cached_events == uncached_events
+    assert cache.hits == 0
+
+def test_profile_counts_do_not_depend_on_the_cache():
+    folds = random_folds(Paper(), 4, random.Random(1))
+    cache = FoldCache()
+    folded_paper(4, folds, cache=cache)
+    with profiling.profiling() as cached:
+        folded_paper(4, folds, cache=cache)
+    with profiling.profiling() as uncached:
+        folded_paper(4, folds, cache=None)
+    assert cached.counters["fold cache hits"] == len(folds)
+    del cached.counters["fold cache hits"]
+    assert cached.counters == uncached.counters
+
+def test_commuting_folds_share_entries():
+    # Folds 3 and 4 fold opposite edges, in either order they leave the same sheet with different layer bits
+    first, second = ALL_FOLDS[3], ALL_FOLDS[4]
+    cache = FoldCache()
+    one_way = folded_paper(4, [first, second], cache=cache)
+    other_way = folded_paper(4, [second, first], cache=cache)
+    assert one_way.state_hash() == other_way.state_hash()
+    next_fold = next(each for each in ALL_FOLDS if one_way.check_fold_is_valid(each))
+    one_way.add_fold(next_fold)
+    hits = cache.hits
+    other_way.add_fold(next_fold)
+    assert cache.hits == hits + 1
+    uncached = folded_paper(4, [second, first, next_fold], cache=None)
+    uncached.state_hash()
+    assert observe(other_way) == observe(uncached)
+
+def test_enumeration_hits_the_cache():
+    # Every node is folded once from a fork of its parent, so hits only come from transpositions
+    cache = FoldCache()
+
+    def expand(paper: Paper, depth: int):
+        for each in ALL_FOLDS:
+            if depth > 0 and paper.check_fold_is_valid(each):
+                child = paper.fork()
+                child.add_fold(each)
+                expand(child, depth - 1)
+
+    expand(Paper(cache=cache), 3)
+    assert cache.hits > 0
@@ -0,0 +1,23 @@
+import random
+from holepunch import fold_trace, profiling
+from holepunch.fold_engine import MAX_FOLDS
+from holepunch.generator import ALL_FOLDS, PuzzleGenerator
+from holepunch.paper import Paper
+
+def test_checking_folds_has_no_side_effects():
+    paper = Paper()
+    with fold_trace.tracing() as events, profiling.profiling() as profile:
+        valid = [fold for fold in ALL_FOLDS if paper.check_fold_is_valid(fold)]
+    assert len(valid) == 19
+    assert events == []
+    assert "cells reflected" not in profile.counters
+
+def test_no_fold_is_valid_at_the_cap():
+    paper = Paper()
+    # Folding the first column over and back never runs out of valid folds
+    for step in range(MAX_FOLDS - 1):
+        paper.add_fold(ALL_FOLDS[step % 2])
+    assert not any(paper.check_fold_is_valid(fold) for fold in ALL_FOLDS)
+    # Samples longer than the cap stop at it instead of failing
+    puzzles = list(PuzzleGenerator().sample(40, min_folds=2, max_folds=MAX_FOLDS + 4, rng=random.Random(0), unique=False))
+    assert max(len(puzzle.folds) for puzzle in puzzles) == MAX_FOLDS - 1
@@ -0,0 +1,12 @@
+import random
+import pytest
+from holepunch.generator import PuzzleGenerator
+
+def test_prefix_cache_is_bounded():
+    bounded, unbounded = PuzzleGenerator(max_prefixes=16), PuzzleGenerator(max_prefixes=1 << 20)
+    samples = [list(generator.sample(300, max_folds=5, rng=random.Random(3), unique=False)) for generator in (bounded, unbounded)]
+    assert samples[0] == samples[1]
+    assert len(bounded._prefixes) <= 16 and len(bounded._next_folds) <= 16
+    assert len(unbounded._prefixes) > 16
+    with pytest.raises(ValueError):
+        PuzzleGenerator(max_prefixes=0)
@@ -0,0 +1,80 @@
+import math
+import random
+import numpy as np
+import pytest
+from holepunch.generator import ALL_FOLDS, PuzzleGenerator
+from holepunch.half_plane import HalfPlaneEngine, LineFold, _area
+from holepunch.point import Point
+
+def random_folds(size: int, count: int, seed: int) -> list[LineFold]:
+    # Lines at any angle through points near the middle of the sheet
+    rng = random.Random(seed)
+    folds = []
+    for _ in range(count):
+        angle = rng.uniform(0, math.pi)
+        x, y = (size - 1) / 2 + rng.uniform(-size / 8, size / 8), (size - 1) / 2 + rng.uniform(-size / 8, size / 8)
+        folds.append(LineFold.through((x, y), (x + math.cos(angle), y + math.sin(angle))))
+    return folds
+
+def test_matches_grid_engine_holes():
+    generator = PuzzleGenerator()
+
+    def walk(sequence: tuple[int, ...]):
+        if sequence:
+            engine = HalfPlaneEngine(4)
+            for index in sequence:
+                engine.apply(ALL_FOLDS[index])
+            paper = generator.paper_for(sequence)
+            points = [Point(x, y) for (x, y) in paper.engine.positions()]
+            assert engine.unfold_cells(points) == paper.engine.unfold(points), sequence
+        if len(sequence) < 2:
+            for index in generator.valid_next_folds(sequence):
+                walk((*sequence, index))
+
+    walk(())
+
+@pytest.mark.parametrize("seed", range(5))
+def test_folding_keeps_the_paper(seed):
+    engine = HalfPlaneEngine(16)
+    for fold in random_folds(16, 8, seed):
+        engine.apply(fold)
+    state = engine.current
+    assert _area(state.vertices, state.counts).sum() == pytest.approx(16 * 16)
+    # Every piece maps back into the cell it was cut from
+    for piece in range(len(state.cell)):
+        vertices = state.vertices[piece, :state.counts[piece]]
+        unfolded = (vertices - state.transform[piece, :, 2]) @ state.transform[piece, :, :2]
+        x, y = state.cell[piece] % 16, state.cell[piece] // 16
+        assert (np.abs(unfolded - (x, y)) <= 0.5 + 1e-9).all()
+
+def test_undo_redo():
+    engine = HalfPlaneEngine(8)
+    folds = random_folds(8, 3, 0)
+    for fold in folds:
+        engine.apply(fold)
+    after = engine.current
+    assert engine.undo() == folds[-1]
+    assert engine.steps == 2
+    engine.redo()
+    assert engine.current is after
+
+@pytest.mark.parametrize("depth", [1, 4, 8])
+def test_fold_sequence_32(benchmark, depth):
+    folds = random_folds(32, depth, 1)
+
+    def fold_sheet():
+        engine = HalfPlaneEngine(32)
+        for fold in folds:
+            engine.apply(fold)
+        return engine
+
+    engine = benchmark(fold_sheet)
+    benchmark.extra_info["pieces"] = len(engine.current.cell)
+
+def test_unfold_32(benchmark):
+    engine = HalfPlaneEngine(32)
+    for fold in random_folds(32, 8, 1):
+        engine.apply(fold)
+    low_x, low_y, high_x, high_y = engine.current.bounds[0]
+    point = ((low_x + high_x) / 2, (low_y + high_y) / 2)
+    assert benchmark(engine.unfold, [point])[0]
@@ -0,0 +1,93 @@
+import random
+import pytest
+from cases import folded_paper, random_folds
+from holepunch.fold_cache import FoldCache
+from holepunch.paper import Paper
+from holepunch.point import Point
+
+GRID = [Point(x, y) for y in range(4) for x in range(4)]
+
+def observe(paper: Paper) -> dict:
+    # Everything a caller can read back from a paper, at every step
+    steps = range(len(paper.folds) + 1)
+    return {
+        "folds": [fold.signature for fold in paper.folds],
+        "state_hash": paper.state_hash(),
+        "stacks": dict(paper.engine.stacks),
+        "states": [[field.tolist() for field in paper.engine.history.state_at(step)] for step in steps],
+        "visible": [paper.engine.visible_cells(step).tolist() for step in steps],
+        "outlines": [paper.get_outline(step) for step in steps],
+        "punched": paper.engine.punched.tolist(),
+        "holes": paper.unfold(GRID),
+    }
+
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+@pytest.mark.parametrize("seed", range(20))
+def test_undo_then_fold_matches_replay(seed, cached):
+    rng = random.Random(seed)
+    paper = Paper(cache=FoldCache() if cached else None)
+    folds = random_folds(paper, 3, rng)
+    # Read every step first so the cached visible cells and outlines are the ones being invalidated
+    observe(paper)
+    undone = rng.randint(1, len(folds))
+    for _ in range(undone):
+        paper.undo_fold()
+    folds = folds[:-undone] + random_folds(paper, rng.randint(1, 2), rng)
+    assert observe(paper) == observe(folded_paper(4, folds))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_redo_restores_the_paper(seed):
+    rng = random.Random(seed)
+    paper = Paper()
+    folds = random_folds(paper, 4, rng)
+    before = observe(paper)
+    for _ in folds:
+        paper.undo_fold()
+    assert observe(paper) == observe(Paper())
+    for _ in folds:
+        paper.redo_fold()
+    assert observe(paper) == before
+    with pytest.raises(IndexError):
+        paper.redo_fold()
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fork_and_parent_are_independent(seed):
+    rng = random.Random(seed)
+    parent = Paper()
+    shared = random_folds(parent, 2, rng)
+    parent.punch(rng.choice(GRID))
+    parent_before = observe(parent)
+
+    child = parent.fork()
+    assert observe(child) == parent_before
+    child.undo_fold()
+    child_folds = shared[:-1] + random_folds(child, 2, rng)
+    child.punch(rng.choice(GRID))
+    child_after = observe(child)
+    assert observe(parent) == parent_before
+
+    parent.undo_fold()
+    parent.undo_fold()
+    parent_folds = random_folds(parent, 3, rng)
+    parent.punch(rng.choice(GRID))
+    assert observe(child) == child_after
+    assert observe(child)["states"] == observe(folded_paper(4, child_folds))["states"]
+    assert observe(parent)["states"] == observe(folded_paper(4, parent_folds))["states"]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_untouched_fork_survives_parent_undo(seed):
+    # Neither side has written since the fork, so they still share the current arrays
+    rng = random.Random(seed)
+    parent = Paper()
+    random_folds(parent, 3, rng)
+    child = parent.fork()
+    before = observe(child)
+    parent.undo_fold()
+    parent.redo_fold()
+    parent.undo_fold()
+    random_folds(parent, 1, rng)
+    assert observe(child) == before
+    # And the other way round
+    fork = child.fork()
+    child.undo_fold()
+    assert observe(fork) == before
@@ -0,0 +1,81 @@
+import pytest
+from cases import folded_paper, halving_folds, single_fold
+from holepunch.outline import trace_outline
+from holepunch.paper import Paper
+from holepunch.point import Point
+
+SIZES = [4, 16, 64, 256]
+DEPTHS = [1, 2, 4, 6, 8]
+# One matplotlib patch per cell makes display_paper far too slow for the larger sheets
+DISPLAY_SIZES = [4, 16]
+
+def sequence_or_skip(size: int, depth: int):
+    folds = halving_folds(size, depth)
+    if folds is None:
+        pytest.skip(f"a {size}x{size} sheet cannot be halved {depth} times")
+    return folds
+
+@pytest.mark.parametrize("kind", ["horizontal", "vertical", "diagonal"])
+@pytest.mark.parametrize("size", SIZES)
+def test_add_fold(benchmark, track_allocations, size, kind):
+    fold = single_fold(size, kind)
+    track_allocations(Paper(size).add_fold, fold)
+    benchmark.pedantic(lambda paper: paper.add_fold(fold), setup=lambda: ((Paper(size),), {}), rounds=20)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("size", SIZES)
+def test_fold_sequence(benchmark, track_allocations, size, depth):
+    folds = sequence_or_skip(size, depth)
+    track_allocations(folded_paper, size, folds)
+    benchmark(folded_paper, size, folds)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("size", SIZES)
+def test_punch(benchmark, track_allocations, size, depth):
+    paper = folded_paper(size, sequence_or_skip(size, depth))
+    point = Point(size - 1, size - 1)
+    track_allocations(paper.punch, point)
+    benchmark(paper.punch, point)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("size", SIZES)
+def test_unfold(benchmark, track_allocations, size, depth):
+    paper = folded_paper(size, sequence_or_skip(size, depth))
+    points = [Point(x, y) for (x, y) in paper.engine.positions()]
+    track_allocations(paper.unfold, points)
+    benchmark(paper.unfold, points)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("size", SIZES)
+def test_get_cells_at_fold(benchmark, track_allocations, size, depth):
+    paper = folded_paper(size, sequence_or_skip(size, depth))
+    track_allocations(paper.get_cells_at_fold, depth)
+    benchmark(paper.get_cells_at_fold, depth)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("size", SIZES)
+def test_trace_outline(benchmark, track_allocations, size, depth):
+    # Uncached, Paper.get_outline would only time a dict lookup after the first round
+    paper = folded_paper(size, sequence_or_skip(size, depth))
+    state = paper.engine.history.state_at(depth)
+    track_allocations(trace_outline, state)
+    benchmark(trace_outline, state)
+
+@pytest.mark.parametrize("depth", [1, 2])
+@pytest.mark.parametrize("size", DISPLAY_SIZES)
+def test_display_paper(benchmark, track_allocations, size, depth):
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from holepunch.plot import display_paper
+
+    cells = folded_paper(size, sequence_or_skip(size, depth)).get_cells_at_fold(depth)
+
+    def draw():
+        figure, axis = plt.subplots()
+        display_paper(cells, axis, show_punched=True, size=size)
+        plt.close(figure)
+        return axis.get_xlim(), axis.get_ylim(), len(axis.get_xticks())
+
+    track_allocations(draw)
+    assert benchmark.pedantic(draw, rounds=5) == ((-0.5, size - 0.5), (-0.5, size - 0.5), size)
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+import pytest
+
+# Cold start of a fresh interpreter running the fold + punch + answer CLI. Every round is a new
+# process, so the timing is dominated by imports.
+#
+#   python -m pytest benchmarks/test_import_time.py --benchmark-columns=min,median,max
+
+BACK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = ["-m", "holepunch", "--fold", "1", "--fold", "7", "--punch", "2,2"]
+HEAVY_MODULES = ["matplotlib", "scipy", "PIL"]
+
+def run(*arguments: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *arguments], cwd=BACK, capture_output=True, text=True, check=True)
+
+def import_times(*arguments: str) -> dict[str, int]:
+    # Cumulative microseconds per top-level package from -X importtime
+    times: dict[str, int] = {}
+    for line in run("-X", "importtime", *arguments).stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            package = name.strip().split(".")[0]
+            times[package] = times.get(package, 0) + int(cumulative)
+    return times
+
+def test_cli_answer():
+    assert run(*CLI).stdout == "[[1, 1], [2, 1], [1, 2], [2, 2]]\n"
+
+def test_cli_skips_heavy_modules():
+    loaded = run("-c", "import sys, runpy; sys.argv = ['holepunch', '--fold', '1', '--punch', '0,0']; "
+                       "runpy.run_module('holepunch', run_name='__main__'); print(*sorted(sys.modules), file=sys.stderr)")
+    modules = {name.split(".")[0] for name in loaded.stderr.split()}
+    assert modules.isdisjoint(HEAVY_MODULES)
+
+def test_cli_cold_start(benchmark):
+    benchmark.extra_info["import_us"] = import_times(*CLI)
+    benchmark.pedantic(run, args=tuple(CLI), rounds=10, warmup_rounds=1)
+
+def test_plot_cold_start(benchmark):
+    # What every CLI run paid while the fold model shared a module with the matplotlib code
+    pytest.importorskip("matplotlib")
+    arguments = ("-c", "import holepunch.plot")
+    benchmark.extra_info["import_us"] = import_times(*arguments)
+    benchmark.pedantic(run, args=arguments, rounds=10, warmup_rounds=1)
@@ -0,0 +1,19 @@
+import json
+import pytest
+from cases import ORACLE_PATH, snapshot
+from holepunch.fold import VerticalFold
+from holepunch.paper import Paper
+
+with open(ORACLE_PATH) as oracle_file:
+    ORACLE = json.load(oracle_file)
+
+@pytest.mark.parametrize("expected", ORACLE, ids=lambda case: "-".join(map(str, case["folds"])))
+def test_paper_matches_oracle(expected):
+    assert snapshot(expected["folds"], [tuple(punch) for punch in expected["punches"]]) == expected
+
+def test_outline_covers_the_top_layer():
+    # After folding the last column over, only the flap on top is outlined
+    paper = Paper()
+    paper.add_fold(VerticalFold(2.5))
+    assert paper.get_outline(0) == [[(-0.5, -0.5), (3.5, -0.5), (3.5, 3.5), (-0.5, 3.5)]]
+    assert paper.get_outline(1) == [[(1.5, -0.5), (2.5, -0.5), (2.5, 3.5), (1.5, 3.5)]]
@@ -0,0 +1,25 @@
+import pytest
+from holepunch import fold_trace
+from holepunch.fold import HorizontalFold, VerticalFold
+from holepunch.fold_trace import ReflectionEvent
+from holepunch.generator import ALL_FOLDS
+from holepunch.point import Point
+
+@pytest.mark.parametrize("fold", [*ALL_FOLDS, VerticalFold(1.5), HorizontalFold(0.5, downward=False)], ids=lambda fold: str(fold.to_dict()))
+def test_reflect_point_matches_fold(fold):
+    for x in range(-1, 5):
+        for y in range(-1, 5):
+            assert Point(x, y).reflect_point(fold) == fold.reflect(Point(x, y))
+
+def test_interning_is_bounded():
+    assert Point(3, 2) is Point(3, 2)
+    cached = len(Point._cache)
+    far = [Point(10_000 + x, -10_000) for x in range(100)]
+    assert len(Point._cache) == cached
+    assert Point(10_000, -10_000) == far[0] and hash(Point(10_000, -10_000)) == hash(far[0])
+
+def test_reflect_point_is_traced():
+    fold = ALL_FOLDS[0]
+    with fold_trace.tracing() as events:
+        reflected = Point(1, 2).reflect_point(fold)
+    assert events == [ReflectionEvent("vertical" if fold.vertical else "horizontal", (1, 2), fold.fold_line, (reflected.x, reflected.y))]
@@ -0,0 +1,29 @@
+from cases import folded_paper, halving_folds
+from holepunch import profiling
+from holepunch.point import Point
+
+def test_profile_counts_fold_work():
+    with profiling.profiling() as profile:
+        paper = folded_paper(16, halving_folds(16, 2))
+        paper.punch(Point(15, 15))
+        paper.get_cells_at_fold(1)
+    assert profile.timers["Paper.add_fold"][0] == 2
+    assert profile.timers["FoldEngine.apply vertical"][0] == profile.timers["FoldEngine.apply horizontal"][0] == 1
+    assert profile.counters["cells changed"] + profile.counters["cells untouched"] == 2 * 16 * 16
+    # Each halving fold moves half of the sheet
+    assert profile.counters["cells moved"] == 16 * 16
+    assert profile.counters["representations allocated"] == 16 * 16
+    assert profiling.current is None
+
+def test_folded_stacks_nest():
+    with profiling.profiling() as profile:
+        folded_paper(4, halving_folds(4, 1))
+    stacks = dict(line.rsplit(" ", 1) for line in profile.to_folded().splitlines())
+    assert "Paper.add_fold;FoldEngine.apply vertical;FoldEngine._fold_effect" in stacks
+    assert all(int(microseconds) >= 1 for microseconds in stacks.values())
+
+def test_disabled_records_nothing():
+    with profiling.profiling() as profile:
+        pass
+    folded_paper(4, halving_folds(4, 2))
+    assert not profile.timers and not profile.counters
@@ -0,0 +1,109 @@
+import struct
+import zlib
+import numpy as np
+import pytest
+from holepunch.fold import VerticalFold
+from holepunch.generator import ALL_FOLDS, PuzzleGenerator
+from holepunch.orientation import Orientation
+from holepunch.paper import Paper
+from holepunch.point import Point
+from holepunch.raster import BACKGROUND, PAPER, encode_png, rasterize, to_svg, write_images
+
+SCALE = 8
+
+def decode_png(data: bytes) -> np.ndarray:
+    # Just enough of PNG for encode_png's output: 8-bit RGB, one IDAT, no filtering
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, offset = {}, 8
+    while offset < len(data):
+        length, kind = struct.unpack_from(">I4s", data, offset)
+        body = data[offset + 8:offset + 8 + length]
+        assert struct.unpack_from(">I", data, offset + 8 + length)[0] == zlib.crc32(kind + body) & 0xFFFFFFFF
+        chunks[kind] = body
+        offset += 12 + length
+    width, height, depth, colour, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    assert (depth, colour) == (8, 2)
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, width * 3 + 1)
+    assert (rows[:, 0] == 0).all()
+    return rows[:, 1:].reshape(height, width, 3)
+
+def polygon_layers(paper: Paper, fold_index: int) -> np.ndarray:
+    # Layers over each pixel centre, counted from the patches display_paper draws
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    from holepunch.plot import display_paper
+
+    class Axis:
+        def __init__(self):
+            self.patches = []
+
+        def add_patch(self, patch):
+            self.patches.append(patch)
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    axis = Axis()
+    display_paper(paper.get_cells_at_fold(fold_index), axis, size=paper.size)
+    size = paper.size
+    centres = (np.arange(size * SCALE) + 0.5) / SCALE - 0.5
+    # Image rows run top to bottom, so y goes down from the top edge of the sheet
+    x, y = np.meshgrid(centres, size - 1 - centres)
+    points = np.column_stack((x.ravel(), y.ravel()))
+    layers = np.zeros(len(points))
+    for patch in axis.patches:
+        layers += patch.get_transform().transform_path(patch.get_path()).contains_points(points)
+    return layers.reshape(size * SCALE, size * SCALE)
+
+def on_a_diagonal(size: int) -> np.ndarray:
+    # Pixels whose centre lies on a cell's diagonal, where polygon containment is ambiguous
+    within = np.arange(size * SCALE) % SCALE
+    column, row = np.meshgrid(within, within)
+    return (column == row) | (column + row == SCALE - 1)
+
+def test_triangles_match_display_paper():
+    generator = PuzzleGenerator()
+    orientations = set()
+    sequences = [(index,) for index in generator.valid_next_folds(())]
+    sequences += [(*sequence, index) for sequence in sequences[::3] for index in generator.valid_next_folds(sequence)]
+    for sequence in sequences:
+        paper = generator.paper_for(sequence)
+        state = paper.engine.history.current
+        orientations.update(state.orientation[state.halved_at > 0].tolist())
+        layers = polygon_layers(paper, len(sequence))
+        expected = BACKGROUND + (PAPER - BACKGROUND) * (1 - 0.5**layers)[..., np.newaxis]
+        image = rasterize(paper, len(sequence), SCALE)
+        compared = ~on_a_diagonal(paper.size)
+        assert (image[compared] == np.round(expected[compared])).all(), sequence
+    # Every kind of triangle was drawn
+    assert len(orientations) == len(Orientation)
+
+def test_png_round_trip():
+    paper = Paper()
+    paper.add_fold(ALL_FOLDS[24])
+    paper.punch(Point(1, 1))
+    image = rasterize(paper, 1, SCALE, show_punched=True)
+    assert (decode_png(encode_png(image)) == image).all()
+
+def test_write_images(tmp_path):
+    paper = Paper()
+    paper.add_fold(ALL_FOLDS[0])
+    items = [("flat", paper, 0), ("folded", paper, 1)]
+    paths = write_images(items, str(tmp_path / "png"), scale=SCALE)
+    assert [path.rsplit("/", 1)[1] for path in paths] == ["flat.png", "folded.png"]
+    for path, (_, _, fold_index) in zip(paths, items):
+        with open(path, "rb") as image_file:
+            assert (decode_png(image_file.read()) == rasterize(paper, fold_index, SCALE)).all()
+    for path, (_, _, fold_index) in zip(write_images(items, str(tmp_path / "svg"), "svg"), items):
+        with open(path) as image_file:
+            assert image_file.read() == to_svg(paper, fold_index)
+    with pytest.raises(ValueError):
+        write_images(items, str(tmp_path), "gif")
+
+def test_cells_off_the_sheet_are_not_drawn():
+    paper = Paper()
+    # Not a valid fold: column 1 lands on column 0, and columns 2 and 3 go off the left edge
+    paper.add_fold(VerticalFold(0.5))
+    assert to_svg(paper, 1).count("<polygon") == 8
+    image = rasterize(paper, 1, SCALE)
+    assert (image[:, :SCALE] != BACKGROUND).all() and (image[:, SCALE:] == BACKGROUND).all()
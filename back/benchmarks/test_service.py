@@ -0,0 +1,88 @@
+import asyncio
+from cases import folded_paper
+from load_test import Client
+from holepunch.generator import ALL_FOLDS
+from holepunch.point import Point
+from holepunch.service import SolverService
+
+PUZZLE = {"folds": [1, {"type": "horizontal", "line": 1.5, "downward": False}], "punches": [[2, 2], [3, 3]]}
+
+def with_service(scenario):
+    async def run():
+        service = SolverService()
+        server = await service.start("127.0.0.1", 0)
+        client = await Client.connect("127.0.0.1", server.sockets[0].getsockname()[1])
+        try:
+            return await scenario(service, client)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(run())
+
+def test_solve_matches_paper():
+    async def scenario(service, client):
+        return await client.request("POST", "/solve", {"puzzles": [PUZZLE]})
+
+    status, response = with_service(scenario)
+    paper = folded_paper(4, [ALL_FOLDS[1], ALL_FOLDS[7]])
+    assert status == 200
+    assert response["results"][0]["holes"] == [[[hole.x, hole.y] for hole in holes] for holes in paper.unfold([Point(2, 2), Point(3, 3)])]
+    assert response["results"][0]["outlines"] == [[[list(vertex) for vertex in loop] for loop in paper.get_outline(step)] for step in range(3)]
+
+def test_batch_errors_stay_in_their_slot():
+    async def scenario(service, client):
+        return await client.request("POST", "/solve", {"puzzles": [
+            {"folds": [1, 1]},
+            {"folds": [99]},
+            {"folds": [{"type": "vertical", "line": float("inf")}]},
+            {"folds": [{"type": "diagonal", "start": [0, float("nan")], "end": [3, 3]}]},
+            {"size": 100000},
+            {"punches": [[4, 0]]},
+            {"size": 2, "punches": [[0, -1]]},
+            PUZZLE,
+        ]})
+
+    status, response = with_service(scenario)
+    assert status == 200
+    assert [set(result) for result in response["results"]] == [{"error"}] * 7 + [{"holes", "outlines"}]
+
+def test_unexpected_errors_are_answered():
+    async def scenario(service, client):
+        async def fail(puzzles):
+            raise RuntimeError("boom")
+
+        service.solve_many = fail
+        return await client.request("POST", "/solve", {"puzzles": [PUZZLE]})
+
+    status, response = with_service(scenario)
+    assert status == 500
+    assert response == {"error": "Internal server error"}
+
+def test_duplicates_are_coalesced_and_cached():
+    async def scenario(service, client):
+        await asyncio.gather(*(service.solve_many([PUZZLE, PUZZLE]) for _ in range(3)))
+        await client.request("POST", "/solve", {"puzzles": [PUZZLE]})
+        return service.stats()
+
+    stats = with_service(scenario)
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 5, 1)
+
+def test_connection_is_kept_alive():
+    async def scenario(service, client):
+        answers = [await client.request("POST", "/solve", {"puzzles": [PUZZLE]}) for _ in range(3)]
+        return answers, await client.request("GET", "/stats"), await client.request("GET", "/missing")
+
+    answers, (_, stats), (missing, _) = with_service(scenario)
+    assert [status for status, _ in answers] == [200, 200, 200]
+    assert stats["requests"] == 4
+    assert missing == 404
+
+def test_negative_content_length_is_rejected():
+    async def scenario(service, client):
+        client.writer.write(b"POST /solve HTTP/1.1\r\nHost: localhost\r\nContent-Length: -1\r\n\r\n")
+        await client.writer.drain()
+        return (await client.reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+
+    assert with_service(scenario).startswith("HTTP/1.1 400 ")
@@ -0,0 +1,48 @@
+from collections import defaultdict
+import pytest
+from holepunch.generator import PuzzleGenerator
+from holepunch.point import Point
+from holepunch.solver import Solution, Solver
+
+def brute_force(depth: int) -> dict[frozenset[Point], set[Solution]]:
+    # Every (fold sequence, punch) of up to `depth` folds through Paper, grouped by the holes it leaves
+    generator = PuzzleGenerator()
+    solutions = defaultdict(set)
+
+    def walk(sequence: tuple[int, ...]):
+        paper = generator.paper_for(sequence)
+        for punch in generator.punch_points(paper):
+            solutions[frozenset(paper.unfold([punch])[0])].add(Solution(sequence, punch))
+        if len(sequence) < depth:
+            for index in generator.valid_next_folds(sequence):
+                walk((*sequence, index))
+
+    walk(())
+    return solutions
+
+def test_matches_brute_force():
+    solver = Solver()
+    for holes, expected in brute_force(3).items():
+        assert set(solver.solve(holes, 3)) == expected, sorted(holes)
+
+def test_unreachable_targets():
+    solver = Solver()
+    # More holes than 2**folds
+    assert solver.solve([Point(x, 0) for x in range(4)], 1) == []
+    with pytest.raises(ValueError):
+        solver.solve([Point(4, 0)])
+    with pytest.raises(ValueError):
+        solver.solve([])
+
+def test_solutions_reproduce_target():
+    generator = PuzzleGenerator()
+    holes = {Point(0, 0), Point(3, 0), Point(0, 3), Point(3, 3)}
+    solutions = Solver().solve(holes, 4)
+    assert solutions
+    for sequence, punch in solutions:
+        assert set(generator.paper_for(sequence).unfold([punch])[0]) == holes
+
+@pytest.mark.parametrize("holes", [[(1, 1)], [(0, 0), (3, 0), (0, 3), (3, 3)], [(0, 1), (1, 1), (2, 1), (3, 1)]], ids=["one", "corners", "row"])
+def test_depth_4(benchmark, holes):
+    solver = Solver()
+    benchmark(solver.solve, [Point(x, y) for x, y in holes], 4)
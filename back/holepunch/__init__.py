@@ -0,0 +1,25 @@
+# Core fold model. Everything imported here only needs numpy, rendering lives in the plot (matplotlib)
+# and raster modules, which are only loaded when imported explicitly.
+from .point import Point
+from .orientation import Orientation
+from .fold import Fold, DiagonalFold, HorizontalFold, VerticalFold, fold_from_dict
+from .cell import Cell, CellRepresentation
+from .fold_cache import FoldCache
+from .paper import Paper
+from .half_plane import HalfPlaneEngine, LineFold
+
+__all__ = [
+    "Point",
+    "Orientation",
+    "Fold",
+    "DiagonalFold",
+    "HorizontalFold",
+    "VerticalFold",
+    "fold_from_dict",
+    "Cell",
+    "CellRepresentation",
+    "FoldCache",
+    "Paper",
+    "HalfPlaneEngine",
+    "LineFold",
+]
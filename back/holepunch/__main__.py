@@ -0,0 +1,46 @@
+import argparse
+import json
+from .fold import Fold, fold_from_dict
+from .generator import ALL_FOLDS
+from .paper import Paper
+from .point import Point
+
+# Folds a sheet, punches it and prints where the holes end up once it is unfolded, one JSON list
+# of [x, y] holes per punch. Folds are indices into ALL_FOLDS or fold dicts as in a question bank.
+#
+#   python -m holepunch --fold 1 --fold 7 --punch 2,2
+#   python -m holepunch --fold '{"type": "vertical", "line": 1.5, "left_fold": false}' --punch 2,0
+
+def parse_fold(text: str) -> Fold:
+    if text.lstrip().startswith("{"):
+        return fold_from_dict(json.loads(text))
+    index = int(text)
+    if not 0 <= index < len(ALL_FOLDS):
+        raise ValueError(f"Fold index {index} is out of bounds")
+    return ALL_FOLDS[index]
+
+def parse_point(text: str) -> Point:
+    x, y = text.split(",")
+    return Point(int(x), int(y))
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m holepunch", description="Fold, punch and print the unfolded holes")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--fold", dest="folds", action="append", default=[], help="ALL_FOLDS index or fold JSON, in order")
+    parser.add_argument("--punch", dest="punches", action="append", required=True, help="x,y on the folded sheet")
+    args = parser.parse_args(argv)
+
+    try:
+        paper = Paper(args.size)
+        for fold in map(parse_fold, args.folds):
+            if not paper.check_fold_is_valid(fold):
+                parser.error(f"Fold {fold.to_dict()} is not valid at step {len(paper.folds) + 1}")
+            paper.add_fold(fold)
+        punches = [parse_point(punch) for punch in args.punches]
+    except (ValueError, KeyError, TypeError, OverflowError) as error:
+        parser.error(str(error))
+    for holes in paper.unfold(punches):
+        print(json.dumps([[hole.x, hole.y] for hole in holes]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import mmap
+import struct
+from typing import Iterable, Iterator
+import numpy as np
+from .fold import Fold, DiagonalFold, HorizontalFold, VerticalFold
+from .fold_engine import MAX_FOLDS
+from .fold_history import FoldState
+from .paper import Paper
+from .point import Point
+
+# Versioned binary format for papers and question banks, little-endian throughout.
+#
+# A file is a 32 byte header, the records back to back, then an index of count + 1 uint64 record
+# offsets (the last one is where the index starts), so the N-th record is found without reading the
+# ones before it. BankFile maps the file and reads records as zero-copy NumPy views of the mapping.
+#
+#   header   magic "HOLEPNCH", version u16, 2 reserved bytes, 4 reserved bytes, count u64, index offset u64
+#
+# A record is one paper: its folds, its punches and what they punched, optionally the holes each punch
+# makes once unfolded, and optionally the full state at every fold step. Sections start 8-byte aligned.
+#
+#   header   size u16, fold count u8, flags u8, punch count u16, fold bytes u16, hole count u32, 4 reserved bytes
+#   folds    one kind byte (type in bits 0-1, direction in bit 2) then the line in half units as i16 for
+#            horizontal and vertical folds, or start x, start y, end x, end y as i16 for diagonal folds
+#   punches  (x, y) i16 pairs
+#   punched  one bit per cell, np.packbits order
+#   holes    FLAG_HOLES: punch count + 1 u32 offsets into the hole list, then the (x, y) i16 hole pairs
+#   state    FLAG_STATE: (fold count + 1, cells) arrays of x i16, y i16, orientation | halved_at << 2 u8,
+#            then layer in the smallest unsigned type that fits fold count bits
+
+MAGIC = b"HOLEPNCH"
+FORMAT_VERSION = 1
+
+FLAG_HOLES = 1
+FLAG_STATE = 2
+
+_FILE_HEADER = struct.Struct("<8sHHIQQ")
+_RECORD_HEADER = struct.Struct("<HBBHHI4x")
+
+_HORIZONTAL, _VERTICAL, _DIAGONAL = 0, 1, 2
+_LINE = struct.Struct("<Bh")
+_DIAGONAL_POINTS = struct.Struct("<Bhhhh")
+
+# Grids are at most this wide, so every position stays in an i16 even after a fold moves it off the sheet
+MAX_SIZE = 1 << 14
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def _layer_dtype(fold_count: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if fold_count <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+def _from_half_units(half_units: int) -> int | float:
+    return half_units // 2 if half_units % 2 == 0 else half_units / 2
+
+def encode_fold(fold: Fold) -> bytes:
+    if fold.horizontal:
+        return _LINE.pack(_HORIZONTAL | fold.downward << 2, fold.reflection_offset[1])
+    elif fold.vertical:
+        return _LINE.pack(_VERTICAL | fold.left_fold << 2, fold.reflection_offset[0])
+    elif isinstance(fold, DiagonalFold):
+        return _DIAGONAL_POINTS.pack(_DIAGONAL | fold.left_fold << 2, fold.start.x, fold.start.y, fold.end.x, fold.end.y)
+    raise ValueError("Unknown fold type")
+
+def decode_folds(data: bytes | memoryview, count: int) -> list[Fold]:
+    folds = []
+    offset = 0
+    for _ in range(count):
+        kind = data[offset]
+        direction = bool(kind & 4)
+        if kind & 3 == _DIAGONAL:
+            _, start_x, start_y, end_x, end_y = _DIAGONAL_POINTS.unpack_from(data, offset)
+            folds.append(DiagonalFold(Point(start_x, start_y), Point(end_x, end_y), left_fold=direction))
+            offset += _DIAGONAL_POINTS.size
+        else:
+            _, half_units = _LINE.unpack_from(data, offset)
+            line = _from_half_units(half_units)
+            folds.append(HorizontalFold(line, downward=direction) if kind & 3 == _HORIZONTAL else VerticalFold(line, left_fold=direction))
+            offset += _LINE.size
+    return folds
+
+def _padded(data: bytes) -> bytes:
+    return data + bytes(_aligned(len(data)) - len(data))
+
+def encode_paper(paper: Paper, include_holes: bool = True, include_state: bool = False) -> bytes:
+    if paper.size >= MAX_SIZE:
+        raise ValueError(f"Grid size {paper.size} must be below {MAX_SIZE}")
+    fold_count = len(paper.folds)
+    folds = b"".join(encode_fold(fold) for fold in paper.folds)
+    punches = np.array([(point.x, point.y) for point in paper.punches], dtype="<i2").reshape(-1, 2)
+    sections = [_padded(folds), _padded(punches.tobytes()), _padded(np.packbits(paper.engine.punched).tobytes())]
+
+    flags = 0
+    hole_count = 0
+    if include_holes:
+        flags |= FLAG_HOLES
+        holes = paper.unfold(paper.punches)
+        offsets = np.cumsum([0] + [len(punch_holes) for punch_holes in holes], dtype="<u4")
+        hole_count = int(offsets[-1])
+        points = np.array([(hole.x, hole.y) for punch_holes in holes for hole in punch_holes], dtype="<i2").reshape(-1, 2)
+        sections += [_padded(offsets.tobytes()), _padded(points.tobytes())]
+    if include_state:
+        flags |= FLAG_STATE
+        states = [paper.engine.history.state_at(step) for step in range(fold_count + 1)]
+        sections += [
+            _padded(np.stack([state.x for state in states]).astype("<i2").tobytes()),
+            _padded(np.stack([state.y for state in states]).astype("<i2").tobytes()),
+            _padded(np.stack([state.orientation.astype(np.uint8) | state.halved_at.astype(np.uint8) << 2 for state in states]).tobytes()),
+            _padded(np.stack([state.layer for state in states]).astype(_layer_dtype(fold_count).newbyteorder("<")).tobytes()),
+        ]
+
+    header = _RECORD_HEADER.pack(paper.size, fold_count, flags, len(paper.punches), len(folds), hole_count)
+    return header + b"".join(sections)
+
+class PaperRecord:
+    # Read-only view of one encoded paper. Every array but the unpacked punched mask is a view of the
+    # underlying buffer, so a record read from a BankFile copies nothing until its fields are used.
+    def __init__(self, buffer: bytes | memoryview):
+        self.buffer = memoryview(buffer)
+        self.size, self.fold_count, self.flags, self.punch_count, fold_bytes, self.hole_count = _RECORD_HEADER.unpack_from(self.buffer)
+        if self.fold_count >= MAX_FOLDS:
+            raise ValueError(f"Record has {self.fold_count} folds, at most {MAX_FOLDS - 1} are supported")
+        self.cell_count: int = self.size * self.size
+        offset = _RECORD_HEADER.size
+        self._folds = self.buffer[offset:offset + fold_bytes]
+        offset = _aligned(offset + fold_bytes)
+        self.punch_array: np.ndarray = self._array("<i2", self.punch_count * 2, offset).reshape(-1, 2)
+        offset = _aligned(offset + self.punch_count * 4)
+        self.punched: np.ndarray = np.unpackbits(self._array(np.uint8, (self.cell_count + 7) // 8, offset), count=self.cell_count).astype(bool)
+        offset = _aligned(offset + (self.cell_count + 7) // 8)
+
+        self.hole_offsets: np.ndarray | None = None
+        self.hole_array: np.ndarray | None = None
+        if self.flags & FLAG_HOLES:
+            self.hole_offsets = self._array("<u4", self.punch_count + 1, offset)
+            offset = _aligned(offset + (self.punch_count + 1) * 4)
+            self.hole_array = self._array("<i2", self.hole_count * 2, offset).reshape(-1, 2)
+            offset = _aligned(offset + self.hole_count * 4)
+
+        self.packed_state: FoldState | None = None
+        if self.flags & FLAG_STATE:
+            shape = (self.fold_count + 1, self.cell_count)
+            fields = []
+            for dtype in ("<i2", "<i2", np.uint8, _layer_dtype(self.fold_count).newbyteorder("<")):
+                fields.append(self._array(dtype, shape[0] * shape[1], offset).reshape(shape))
+                offset = _aligned(offset + fields[-1].nbytes)
+            x, y, packed, layer = fields
+            # orientation and halved_at share one byte, both are split out of `packed` by state()
+            self.packed_state = FoldState(x, y, packed, packed, layer)
+        self.nbytes: int = offset
+
+    def _array(self, dtype, count: int, offset: int) -> np.ndarray:
+        return np.frombuffer(self.buffer, dtype=dtype, count=count, offset=offset)
+
+    @property
+    def folds(self) -> list[Fold]:
+        return decode_folds(self._folds, self.fold_count)
+
+    @property
+    def punches(self) -> list[Point]:
+        return [Point(x, y) for x, y in self.punch_array.tolist()]
+
+    @property
+    def holes(self) -> list[list[Point]] | None:
+        if self.hole_array is None:
+            return None
+        points = [Point(x, y) for x, y in self.hole_array.tolist()]
+        offsets = self.hole_offsets.tolist()
+        return [points[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def state(self, step: int) -> FoldState:
+        # The state at a fold step in the engine's own dtypes, freshly allocated
+        if self.packed_state is None:
+            raise ValueError("Record was written without its fold states")
+        if step < 0 or step > self.fold_count:
+            raise ValueError(f"Fold index {step} is out of bounds")
+        x, y, packed, _, layer = (field[step] for field in self.packed_state)
+        return FoldState(
+            x.astype(np.int64),
+            y.astype(np.int64),
+            (packed & 3).astype(np.int8),
+            (packed >> 2).astype(np.int8),
+            layer.astype(np.int64),
+        )
+
+    def paper(self) -> Paper:
+        # Rebuilds the Paper, from the stored states if there are any, otherwise by folding it again
+        paper = Paper(self.size)
+        for step, fold in enumerate(self.folds, start=1):
+            if self.packed_state is None:
+                paper.add_fold(fold)
+            else:
+                paper.folds.append(fold)
+                paper.engine.record(self.state(step))
+        paper.punches = self.punches
+        paper.engine.punched[:] = self.punched
+        return paper
+
+def decode_paper(buffer: bytes | memoryview) -> Paper:
+    return PaperRecord(buffer).paper()
+
+def write_bank(path: str, papers: Iterable[Paper], include_holes: bool = True, include_state: bool = False) -> int:
+    # Streams the records to disk, only their offsets are kept in memory. Returns the record count.
+    offsets = []
+    with open(path, "wb") as bank_file:
+        bank_file.write(bytes(_FILE_HEADER.size))
+        offset = _FILE_HEADER.size
+        for paper in papers:
+            offsets.append(offset)
+            record = encode_paper(paper, include_holes, include_state)
+            bank_file.write(record)
+            offset += len(record)
+        offsets.append(offset)
+        bank_file.write(np.array(offsets, dtype="<u8").tobytes())
+        bank_file.seek(0)
+        bank_file.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, len(offsets) - 1, offset))
+    return len(offsets) - 1
+
+class BankFile:
+    # Memory-mapped bank. Opening it only reads the header and maps the index, bank[n] decodes the
+    # record header of the N-th paper and nothing else.
+    def __init__(self, path: str):
+        with open(path, "rb") as bank_file:
+            self._mmap = mmap.mmap(bank_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        if len(self._buffer) < _FILE_HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a bank file")
+        magic, version, _, _, count, index_offset = _FILE_HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a bank file")
+        if version > FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is format version {version}, only versions up to {FORMAT_VERSION} can be read")
+        self.version: int = version
+        self.count: int = count
+        self.offsets: np.ndarray = np.frombuffer(self._buffer, dtype="<u8", count=count + 1, offset=index_offset)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> PaperRecord:
+        if self._mmap is None:
+            raise ValueError("Bank file is closed")
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError(f"Record {index} is out of bounds")
+        return PaperRecord(self._buffer[int(self.offsets[index]):int(self.offsets[index + 1])])
+
+    def __iter__(self) -> Iterator[PaperRecord]:
+        return (self[index] for index in range(self.count))
+
+    def close(self):
+        # Records still alive (and arrays taken from them) keep pointing into the mapping and stay
+        # readable, it is then unmapped by the garbage collector once the last of them is gone
+        self.offsets = None
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._mmap = None
+
+    def __enter__(self) -> 'BankFile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
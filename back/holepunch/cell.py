@@ -1,5 +1,8 @@
-from point import Point
-from orientation import Orientation
+import logging
+from .point import Point
+from .orientation import Orientation
+
+logger = logging.getLogger(__name__)
 
 class Cell:
     def __init__(self, origin: Point):
@@ -29,6 +32,8 @@ class Cell:
         return f"Cell at {self.locations} (origin={self.origin}), punched={self.is_punched}"
     
 class CellRepresentation:
+    __slots__ = ("point", "orientation", "is_halved", "_z_index")
+
     def __init__(self, point: Point, 
                  orientation: Orientation = Orientation.TOP_LEFT, 
                  is_halved: bool = False,
@@ -51,7 +56,7 @@ class CellRepresentation:
         return [self._z_index]
     
     def get_top_left(self) -> tuple[float, float]:
-        print(self.orientation)
+        logger.debug("Top left corner of %s cell", self.orientation)
         if self.is_halved and self.orientation == Orientation.BOTTOM_RIGHT:
             return None
             
@@ -72,4 +77,30 @@ class CellRepresentation:
     def get_bottom_right(self) -> tuple[float, float]:
         if self.is_halved and self.orientation == Orientation.TOP_LEFT:
             return None
-        return (self.point.x + 0.5, self.point.y - 0.5)
\ No newline at end of file
+        return (self.point.x + 0.5, self.point.y - 0.5)
+
+class CellView(Cell):
+    # A Cell whose history lives in a FoldEngine column instead of its own locations list
+    def __init__(self, origin: Point, engine: 'FoldEngine', index: int):
+        self.origin: Point = origin
+        self.engine = engine
+        self.index: int = index
+
+    @property
+    def locations(self) -> list[CellRepresentation]:
+        return [self.engine.representation(step, self.index) for step in range(self.engine.steps + 1)]
+
+    @property
+    def is_punched(self) -> bool:
+        return bool(self.engine.punched[self.index])
+
+    def add_location(self, cell_representation: CellRepresentation):
+        raise TypeError("CellView locations are managed by its FoldEngine")
+
+    def get_location_at(self, index: int) -> CellRepresentation:
+        if index < 0 or index > self.engine.steps:
+            raise IndexError("Index out of bounds for cell locations")
+        return self.engine.representation(index, self.index)
+
+    def punch(self):
+        self.engine.punched[self.index] = True
@@ -0,0 +1,119 @@
+from abc import ABC, abstractmethod
+import math
+from .point import Point
+import numpy as np
+
+class Fold(ABC):
+    def __init__(self, left_fold: bool = True, horizontal: bool = False, vertical: bool = False):
+        self.left_fold: bool = left_fold
+        self.horizontal: bool = horizontal
+        self.vertical: bool = vertical
+        self.fold_line: tuple[int, int] = self._compute_fold_line()
+        # Reflection across the fold line as p' = matrix @ p + offset. The offset is twice a point on
+        # the fold line, i.e. the line in half-unit coordinates, so 0.5/1.5/2.5 lines stay integers.
+        self.reflection_matrix: tuple[tuple[int, int], tuple[int, int]]
+        self.reflection_offset: tuple[int, int]
+        self.reflection_matrix, self.reflection_offset = self._compute_reflection()
+
+    @abstractmethod
+    def _compute_fold_line(self) -> tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def _compute_reflection(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        pass
+
+    @property
+    def signature(self) -> tuple:
+        # Identifies what the fold does rather than how it was written, e.g. a diagonal given by its
+        # end points in either order has the same signature
+        return (self.horizontal, self.vertical, self.left_fold, self.reflection_matrix, self.reflection_offset)
+
+    def reflect(self, point: Point) -> Point:
+        (a, b), (c, d) = self.reflection_matrix
+        offset_x, offset_y = self.reflection_offset
+        return Point(a * point.x + b * point.y + offset_x, c * point.x + d * point.y + offset_y)
+
+    def reflect_many(self, points) -> np.ndarray:
+        # points is an (n, 2) array-like of integer (x, y) pairs, reflected in one integer matrix multiply
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        return points @ np.array(self.reflection_matrix, dtype=np.int64).T + np.array(self.reflection_offset, dtype=np.int64)
+
+def _half_units(fold_on: float) -> int:
+    if not math.isfinite(fold_on):
+        raise ValueError(f"Fold line {fold_on} must be finite")
+    if 2 * fold_on != int(2 * fold_on):
+        raise ValueError(f"Fold line {fold_on} must lie on a whole or half cell")
+    return int(2 * fold_on)
+    
+class DiagonalFold(Fold):
+    def __init__(self, start: Point, end: Point, left_fold: bool = True):
+        if not (start.x != end.x and start.y != end.y):
+            raise ValueError("Diagonal fold must have different x and y coordinates")
+        if abs(end.y - start.y) != abs(end.x - start.x):
+            raise ValueError("Diagonal fold must have a slope of 1 or -1")
+        self.start = start
+        self.end = end
+        super().__init__(left_fold=left_fold, horizontal=False, vertical=False)
+        
+    def _compute_fold_line(self) -> tuple[int, int]:
+        # Diagonal fold, kept in integers since the slope is always 1 or -1
+        slope = 1 if (self.end.y - self.start.y) * (self.end.x - self.start.x) > 0 else -1
+        intercept = self.start.y - slope * self.start.x
+        return (slope, intercept)
+
+    def _compute_reflection(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], tuple[int, int]]:
+        # Across y = slope * x + intercept: (x, y) -> (slope * (y - intercept), slope * x + intercept)
+        slope, intercept = self.fold_line
+        return ((0, slope), (slope, 0)), (-slope * intercept, intercept)
+
+    def to_dict(self) -> dict:
+        return {"type": "diagonal", "start": [self.start.x, self.start.y], "end": [self.end.x, self.end.y], "left_fold": self.left_fold}
+
+class HorizontalFold(Fold):
+    def __init__(self, fold_line: int, downward: bool = True):
+        self.fold_on: int = fold_line
+        self.downward: bool = downward
+        super().__init__(horizontal=True, vertical=False, left_fold=downward)
+        
+    
+    def _compute_fold_line(self) -> tuple[int, int]:
+        if self.fold_on < 0:
+            raise ValueError(f"Fold line {self.fold_on} must not be negative")
+        return (0, self.fold_on)
+
+    def _compute_reflection(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], tuple[int, int]]:
+        return ((1, 0), (0, -1)), (0, _half_units(self.fold_on))
+
+    def to_dict(self) -> dict:
+        return {"type": "horizontal", "line": self.fold_on, "downward": self.downward}
+
+class VerticalFold(Fold):
+    def __init__(self, fold_line: int, left_fold: bool = True):
+        self.fold_on: int = fold_line
+        super().__init__(horizontal=False, vertical=True, left_fold=left_fold)
+    
+    def _compute_fold_line(self) -> tuple[int, int]:
+        if self.fold_on < 0:
+            raise ValueError(f"Fold line {self.fold_on} must not be negative")
+        return (1, self.fold_on)
+
+    def _compute_reflection(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], tuple[int, int]]:
+        return ((-1, 0), (0, 1)), (_half_units(self.fold_on), 0)
+
+    def to_dict(self) -> dict:
+        return {"type": "vertical", "line": self.fold_on, "left_fold": self.left_fold}
+
+def fold_from_dict(data: dict) -> Fold:
+    if data["type"] == "horizontal":
+        return HorizontalFold(data["line"], downward=data.get("downward", True))
+    elif data["type"] == "vertical":
+        return VerticalFold(data["line"], left_fold=data.get("left_fold", True))
+    elif data["type"] == "diagonal":
+        return DiagonalFold(Point(*data["start"]), Point(*data["end"]), left_fold=data.get("left_fold", True))
+    else:
+        raise ValueError(f"Unknown fold type {data['type']!r}")
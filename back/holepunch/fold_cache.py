@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from .fold_history import FoldEffect
+
+class FoldCache:
+    # LRU map from (state hash, fold signature) to the effect of the fold and the hash of the state it
+    # produces, shared by every FoldEngine given the same cache. Cached effects are never written,
+    # engines apply them to their own layers.
+    def __init__(self, max_size: int = 4096):
+        if max_size < 1:
+            raise ValueError(f"Cache size {max_size} must be at least 1")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[tuple, tuple[FoldEffect, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> tuple[FoldEffect, bytes] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, effect: FoldEffect, state_hash: bytes):
+        self._entries[key] = (effect, state_hash)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
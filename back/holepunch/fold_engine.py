@@ -0,0 +1,327 @@
+import hashlib
+import numpy as np
+from . import fold_trace
+from . import profiling
+from .fold_trace import ReflectionEvent
+from .fold import Fold, DiagonalFold
+from .cell import CellRepresentation
+from .point import Point
+from .orientation import Orientation
+from .fold_history import FoldEffect, FoldHistory, FoldState
+from .fold_cache import FoldCache
+from .profiling import profiled
+
+# Orientations are stored as int8 codes indexing into this list
+ORIENTATIONS: list[Orientation] = list(Orientation)
+ORIENTATION_CODES: dict[Orientation, int] = {orientation: code for code, orientation in enumerate(ORIENTATIONS)}
+_VERTICAL_FLIP = np.array([ORIENTATION_CODES[orientation.vertical_flip()] for orientation in ORIENTATIONS], dtype=np.int8)
+_HORIZONTAL_FLIP = np.array([ORIENTATION_CODES[orientation.horizontal_flip()] for orientation in ORIENTATIONS], dtype=np.int8)
+
+# Layers are int64 bitmasks with one bit per fold
+MAX_FOLDS = 64
+
+_Y_BIAS = 1 << 31
+
+
+def _fold_kind(fold: Fold) -> str:
+    return "horizontal" if fold.horizontal else "vertical" if fold.vertical else "diagonal"
+
+
+def _digest(steps: int, state: FoldState) -> bytes:
+    # Hashes the canonical form of a state: positions, orientations, which cells are halved, and the
+    # rank of every (half) cell within its stack. Raw layers and halved_at depend on the order of the
+    # folds that built the stack, e.g. two folds on opposite edges give the same sheet either way round
+    # but different layer bits.
+    halved = state.halved_at > 0
+    partner = state.layer ^ ((np.int64(1) << state.halved_at.astype(np.int64)) - 1)
+    codes = _position_codes(state.x, state.y)
+    all_codes = np.concatenate((codes, codes[halved]))
+    order = np.lexsort((np.concatenate((state.layer, partner[halved])), all_codes))
+    sorted_codes = all_codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ranks = np.empty(len(all_codes), dtype=np.int64)
+    ranks[order] = np.arange(len(all_codes)) - np.repeat(starts, np.diff(np.r_[starts, len(all_codes)]))
+    partner_ranks = np.full(len(codes), -1, dtype=np.int64)
+    partner_ranks[halved] = ranks[len(codes):]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(steps.to_bytes(2, "little"))
+    for field in (state.x, state.y, state.orientation, halved, ranks[:len(codes)], partner_ranks):
+        digest.update(np.ascontiguousarray(field).tobytes())
+    return digest.digest()
+
+
+def _position_codes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # One int64 per position that sorts by x then y, y is biased into the low 32 bits so positions
+    # off the sheet (within +-2**31) still encode
+    return (x.astype(np.int64) << 32) + (y.astype(np.int64) + _Y_BIAS)
+
+def _position_code(x: int, y: int) -> int:
+    return (int(x) << 32) + (int(y) + _Y_BIAS)
+
+def _decode_positions(codes: np.ndarray) -> tuple[list[int], list[int]]:
+    return (codes >> 32).tolist(), ((codes & 0xFFFFFFFF) - _Y_BIAS).tolist()
+
+
+class FoldEngine:
+    def __init__(self, size: int = 4, cache: FoldCache | None = None):
+        if size < 1:
+            raise ValueError(f"Grid size {size} must be at least 1")
+        self.size: int = size
+        self.cell_count: int = size * size
+        self.cache: FoldCache | None = cache
+        self._state_hash: bytes | None = None
+        self.punched = np.zeros(self.cell_count, dtype=bool)
+
+        self._visible_cells: dict[int, np.ndarray] = {}
+
+        y, x = np.divmod(np.arange(self.cell_count, dtype=np.int64), size)
+        # Spatial index from a position on the folded sheet to the cells stacked there: the position
+        # codes of the current step sorted, and the cells in that order. Built on the first lookup
+        # after a fold, undo or redo, so folding stays a handful of whole-array operations.
+        self._index: tuple[np.ndarray, np.ndarray] | None = None
+        self.history: FoldHistory = FoldHistory(FoldState(
+            x,
+            y,
+            np.full(self.cell_count, ORIENTATION_CODES[Orientation.TOP_LEFT], dtype=np.int8),
+            np.zeros(self.cell_count, dtype=np.int8),
+            np.zeros(self.cell_count, dtype=np.int64),
+        ))
+
+    @property
+    def steps(self) -> int:
+        return self.history.steps
+
+    def _trace(self, fold: Fold, x: np.ndarray, y: np.ndarray, reflected_x: np.ndarray, reflected_y: np.ndarray):
+        fold_trace.events.extend(
+            ReflectionEvent(_fold_kind(fold), point, fold.fold_line, reflected_point)
+            for point, reflected_point in zip(zip(x.tolist(), y.tolist()), zip(reflected_x.tolist(), reflected_y.tolist()))
+        )
+
+    def state_hash(self) -> bytes:
+        # Digest of the current fold state, equal for any two fold sequences of the same length that
+        # put every cell at the same place, the same way up and at the same height in its stack
+        if self._state_hash is None:
+            self._state_hash = _digest(self.steps, self.history.current)
+        return self._state_hash
+
+    def apply(self, fold: Fold):
+        profile = profiling.current
+        if profile is None:
+            self._apply(fold)
+            return
+        with profile.measure(f"FoldEngine.apply {_fold_kind(fold)}"):
+            hits = self.cache.hits if self.cache is not None else 0
+            self._apply(fold)
+            changed = len(self.history.changes[-1][0])
+            profile.count(f"folds {_fold_kind(fold)}")
+            profile.count("cells changed", changed)
+            profile.count("cells untouched", self.cell_count - changed)
+            _, before, after = self.history.changes[-1]
+            moved = (before.x != after.x) | (before.y != after.y)
+            profile.count("cells moved", int(moved.sum()))
+            profile.count("stacks moved", len(np.unique(_position_codes(before.x[moved], before.y[moved]))))
+            if self.cache is not None and fold_trace.events is None:
+                profile.count("fold cache hits" if self.cache.hits > hits else "fold cache misses")
+
+    def _apply(self, fold: Fold):
+        if self.steps + 1 >= MAX_FOLDS:
+            raise ValueError(f"A sheet can be folded at most {MAX_FOLDS - 1} times")
+        # The cache is bypassed while tracing, a hit would skip the reflections tracing records
+        if self.cache is None or fold_trace.events is not None:
+            state, state_hash = self._apply_effect(self._fold_effect(fold)), None
+        else:
+            key = (self.size, self.state_hash(), fold.signature)
+            entry = self.cache.get(key)
+            if entry is None:
+                effect = self._fold_effect(fold)
+                state = self._apply_effect(effect)
+                state_hash = _digest(self.steps + 1, state)
+                self.cache.put(key, effect, state_hash)
+            else:
+                effect, state_hash = entry
+                state = self._apply_effect(effect)
+                if profiling.current is not None:
+                    # Counted as if reflected, so the counter doesn't depend on whether a cache is
+                    # attached, "fold cache hits" tells how many folds were skipped
+                    profiling.current.count("cells reflected", self.cell_count)
+        self.record(state, state_hash)
+
+    def _apply_effect(self, effect: FoldEffect) -> FoldState:
+        # The next state from this sheet's own layers, in new arrays for FoldHistory.record, since
+        # effects may be shared through the cache
+        step = self.steps + 1
+        current = self.history.current
+        return FoldState(
+            effect.x.copy(),
+            effect.y.copy(),
+            effect.orientation.copy(),
+            np.where(effect.halved, step, current.halved_at).astype(np.int8),
+            # Moving a cell over the fold mirrors its stacking order within the 2**step layers
+            np.where(effect.flipped, current.layer ^ (2**step - 1), current.layer),
+        )
+
+    def record(self, state: FoldState, state_hash: bytes | None = None):
+        # Makes an already folded state the next step, e.g. one loaded from a file instead of folded.
+        # Ownership of the state's arrays passes to the history, see FoldHistory.record.
+        self.history.record(state)
+        self._state_hash = state_hash
+        self._index = None
+
+    def undo(self):
+        self.history.undo()
+        self._state_hash = None
+        self._index = None
+        for step in [step for step in self._visible_cells if step > self.steps]:
+            del self._visible_cells[step]
+
+    def redo(self):
+        self.history.redo()
+        self._state_hash = None
+        self._index = None
+
+    def fork(self) -> 'FoldEngine':
+        engine = FoldEngine.__new__(FoldEngine)
+        engine.size = self.size
+        engine.cell_count = self.cell_count
+        engine.cache = self.cache
+        engine._state_hash = self._state_hash
+        engine.punched = self.punched.copy()
+        engine.history = self.history.fork()
+        # The index arrays are never written, only replaced
+        engine._index = self._index
+        engine._visible_cells = dict(self._visible_cells)
+        return engine
+
+    def can_fold(self, fold: Fold) -> bool:
+        # Same rule as the frontend's checkFoldIsValid: something has to move, and nothing that
+        # moves may land off the sheet. Only asks, so nothing is traced or counted.
+        if self.steps + 1 >= MAX_FOLDS:
+            return False
+        reflected_x, reflected_y, moved = self._reflect(fold)
+        if not moved.any():
+            return False
+        new_x, new_y = reflected_x[moved], reflected_y[moved]
+        return bool(((new_x >= 0) & (new_x < self.size) & (new_y >= 0) & (new_y < self.size)).all())
+
+    def _reflect(self, fold: Fold) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Every cell's reflection across the fold, and which cells the fold moves over it
+        x, y = self.history.current.x, self.history.current.y
+        reflected = fold.reflect_many(np.column_stack((x, y)))
+        reflected_x, reflected_y = reflected[:, 0], reflected[:, 1]
+        if fold.horizontal:
+            moved = reflected_y < y if fold.downward else reflected_y > y
+        elif fold.vertical or isinstance(fold, DiagonalFold):
+            moved = reflected_x < x if fold.left_fold else reflected_x > x
+        else:
+            raise ValueError("Unknown fold type")
+        return reflected_x, reflected_y, moved
+
+    @profiled("FoldEngine._fold_effect")
+    def _fold_effect(self, fold: Fold) -> FoldEffect:
+        x, y, orientation, halved_at, _ = self.history.current
+        reflected_x, reflected_y, moved = self._reflect(fold)
+        if profiling.current is not None:
+            profiling.current.count("cells reflected", len(x))
+        if fold_trace.events is not None:
+            self._trace(fold, x, y, reflected_x, reflected_y)
+
+        if fold.horizontal:
+            new_orientation = np.where(moved, _HORIZONTAL_FLIP[orientation], orientation)
+            return FoldEffect(moved, x.copy(), np.where(moved, reflected_y, y), new_orientation, np.zeros_like(moved))
+        if fold.vertical:
+            new_orientation = np.where(moved, _VERTICAL_FLIP[orientation], orientation)
+            return FoldEffect(moved, np.where(moved, reflected_x, x), y.copy(), new_orientation, np.zeros_like(moved))
+        on_line = reflected_x == x
+        if fold.left_fold:
+            line_orientation = Orientation.BOTTOM_LEFT if fold.fold_line[0] < 0 else Orientation.TOP_LEFT
+        else:
+            line_orientation = Orientation.TOP_RIGHT if fold.fold_line[0] < 0 else Orientation.BOTTOM_RIGHT
+        # Cells on the fold line keep their layer for the half that stays and are halved by this fold,
+        # unless they were already halved, in which case both halves are mirrored like a moved cell
+        already_halved = halved_at > 0
+        return FoldEffect(
+            moved | (on_line & already_halved),
+            np.where(moved | on_line, reflected_x, x),
+            np.where(moved | on_line, reflected_y, y),
+            np.where(
+                on_line,
+                ORIENTATION_CODES[line_orientation],
+                np.where(moved, ORIENTATION_CODES[Orientation.TOP_LEFT], orientation),
+            ).astype(np.int8),
+            on_line & ~already_halved,
+        )
+
+    @profiled("FoldEngine.index")
+    def index(self) -> tuple[np.ndarray, np.ndarray]:
+        # (sorted position codes, cells in that order) of the current step, cells at one position
+        # are contiguous and in cell order
+        if self._index is None:
+            current = self.history.current
+            codes = _position_codes(current.x, current.y)
+            order = np.argsort(codes, kind="stable")
+            self._index = (codes[order], order)
+        return self._index
+
+    def stack_at(self, point: Point) -> tuple[int, ...]:
+        codes, order = self.index()
+        code = _position_code(point.x, point.y)
+        return tuple(order[np.searchsorted(codes, code, "left"):np.searchsorted(codes, code, "right")].tolist())
+
+    def positions(self) -> list[tuple[int, int]]:
+        # Every position something lies at, sorted by x then y
+        codes = np.unique(self.index()[0])
+        return list(zip(*_decode_positions(codes)))
+
+    @property
+    def stacks(self) -> dict[tuple[int, int], tuple[int, ...]]:
+        # Every stack at once, for inspection. Lookups of single positions should use stack_at.
+        codes, order = self.index()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        xs, ys = _decode_positions(codes[starts])
+        cells = np.split(order, starts[1:])
+        return {(x, y): tuple(stack.tolist()) for x, y, stack in zip(xs, ys, cells)}
+
+    def punch(self, point: Point):
+        self.punched[list(self.stack_at(point))] = True
+
+    def unfold(self, points: list[Point]) -> list[list[int]]:
+        # Cells a punch at each point would go through, without punching the sheet
+        return [sorted(self.stack_at(point)) for point in points]
+
+    def representation(self, step: int, index: int) -> CellRepresentation:
+        if profiling.current is not None:
+            profiling.current.count("representations allocated")
+        return self._representation(*self.history.cell_at(step, index))
+
+    def _representation(self, x, y, orientation, halved_at, layer) -> CellRepresentation:
+        layer = int(layer)
+        z_indexes = [layer, layer ^ (2**int(halved_at) - 1)] if halved_at else [layer]
+        return CellRepresentation(
+            Point(x, y),
+            orientation=ORIENTATIONS[orientation],
+            is_halved=bool(halved_at),
+            z_index=z_indexes,
+        )
+
+    def visible_cells(self, step: int) -> np.ndarray:
+        # Indices of the cells on the topmost layer at a fold step, cached since history never changes
+        if step < 0 or step > self.steps:
+            raise ValueError(f"Fold index {step} is out of bounds")
+        visible = self._visible_cells.get(step)
+        if visible is None:
+            top_z_index = self.history.state_at(step).top_z_index()
+            visible = np.flatnonzero(top_z_index == top_z_index.max())
+            self._visible_cells[step] = visible
+        return visible
+
+    def cells_at(self, step: int) -> dict[Point, list[tuple[bool, CellRepresentation]]]:
+        if step < 0 or step > self.steps:
+            raise ValueError(f"Fold index {step} is out of bounds")
+        cells_at_step: dict[Point, list[tuple[bool, CellRepresentation]]] = {}
+        for is_punched, *cell_state in zip(self.punched.tolist(), *(field.tolist() for field in self.history.state_at(step))):
+            cell_representation = self._representation(*cell_state)
+            cells_at_step.setdefault(cell_representation.point, []).append((is_punched, cell_representation))
+        if profiling.current is not None:
+            profiling.current.count("representations allocated", self.cell_count)
+        return cells_at_step
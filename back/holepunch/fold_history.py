@@ -0,0 +1,126 @@
+from bisect import bisect_right
+from typing import NamedTuple
+import numpy as np
+
+class FoldState(NamedTuple):
+    # Per-cell state of a sheet, cell = y * size + x of the cell's origin.
+    # layer is the cell's stacking order, bit k - 1 set means fold k laid it over the rest, and a
+    # mirror over fold k is layer ^ (2**k - 1). halved_at is the fold that halved the cell (0 if it
+    # is whole), the other half's z-index is always layer ^ (2**halved_at - 1).
+    x: np.ndarray
+    y: np.ndarray
+    orientation: np.ndarray
+    halved_at: np.ndarray
+    layer: np.ndarray
+
+    def take(self, indices: np.ndarray) -> 'FoldState':
+        return FoldState(*(field[indices] for field in self))
+
+    def copy(self) -> 'FoldState':
+        return FoldState(*(field.copy() for field in self))
+
+    def top_z_index(self) -> np.ndarray:
+        halved_partner = self.layer ^ ((np.int64(1) << self.halved_at.astype(np.int64)) - 1)
+        return np.where(self.halved_at > 0, np.maximum(self.layer, halved_partner), self.layer)
+
+    def changed_from(self, other: 'FoldState') -> np.ndarray:
+        changed = (self.x != other.x) | (self.y != other.y) | (self.orientation != other.orientation)
+        changed |= (self.halved_at != other.halved_at) | (self.layer != other.layer)
+        return np.flatnonzero(changed)
+
+class FoldEffect(NamedTuple):
+    # What a fold does to a sheet, independent of how its layers got their values: where each cell
+    # goes, its new orientation, which cells the fold mirrors onto the other side (layer ^
+    # (2**k - 1) for fold k) and which it halves. Two sheets in the same canonical state (see
+    # FoldEngine.state_hash) get the same effect from the same fold.
+    flipped: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    orientation: np.ndarray
+    halved: np.ndarray
+
+class FoldHistory:
+    # Persistent fold history: step 0 is stored in full, every later step only stores the cells that
+    # changed in that fold, with their state before and after it. Each cell keeps the sorted tuple of
+    # steps it changed at, so looking a cell up at any step is a bisect instead of a walk through every
+    # fold. Undo and redo only touch the changed cells, and fork() shares everything recorded so far.
+    def __init__(self, initial: FoldState):
+        self.initial: FoldState = initial
+        self.current: FoldState = initial
+        # Set while the current arrays are referenced elsewhere, they are copied before being written
+        self._current_shared: bool = True
+        self.changes: list[tuple[np.ndarray, FoldState, FoldState]] = []
+        self.undone: list[tuple[np.ndarray, FoldState, FoldState]] = []
+        self.cell_steps: list[tuple[int, ...]] = [()] * len(initial.x)
+
+    @property
+    def steps(self) -> int:
+        return len(self.changes)
+
+    def record(self, state: FoldState):
+        # state must be freshly allocated, the history takes ownership of its arrays
+        changed = state.changed_from(self.current)
+        self.changes.append((changed, self.current.take(changed), state.take(changed)))
+        step = len(self.changes)
+        for index in changed.tolist():
+            self.cell_steps[index] += (step,)
+        self.current = state
+        self._current_shared = False
+        self.undone = []
+
+    def undo(self):
+        if not self.changes:
+            raise IndexError("No fold to undo")
+        changed, before, after = self.changes.pop()
+        self.undone.append((changed, before, after))
+        self._write_current(changed, before)
+        for index in changed.tolist():
+            self.cell_steps[index] = self.cell_steps[index][:-1]
+
+    def redo(self):
+        if not self.undone:
+            raise IndexError("No fold to redo")
+        changed, before, after = self.undone.pop()
+        self.changes.append((changed, before, after))
+        self._write_current(changed, after)
+        step = len(self.changes)
+        for index in changed.tolist():
+            self.cell_steps[index] += (step,)
+
+    def _write_current(self, changed: np.ndarray, values: FoldState):
+        if self._current_shared:
+            self.current = self.current.copy()
+            self._current_shared = False
+        for field, field_values in zip(self.current, values):
+            field[changed] = field_values
+
+    def fork(self) -> 'FoldHistory':
+        # Deltas are never modified once recorded and cell_steps holds tuples, so a fork only needs
+        # its own outer lists
+        history = FoldHistory.__new__(FoldHistory)
+        history.initial = self.initial
+        history.current = self.current
+        history.changes = list(self.changes)
+        history.undone = list(self.undone)
+        history.cell_steps = list(self.cell_steps)
+        history._current_shared = self._current_shared = True
+        return history
+
+    def state_at(self, step: int) -> FoldState:
+        if step == self.steps:
+            self._current_shared = True
+            return self.current
+        state = self.initial.copy()
+        for changed, _, delta in self.changes[:step]:
+            for field, values in zip(state, delta):
+                field[changed] = values
+        return state
+
+    def cell_at(self, step: int, index: int) -> tuple:
+        cell_steps = self.cell_steps[index]
+        position = bisect_right(cell_steps, step)
+        if position == 0:
+            return tuple(field[index] for field in self.initial)
+        changed, _, delta = self.changes[cell_steps[position - 1] - 1]
+        row = np.searchsorted(changed, index)
+        return tuple(field[row] for field in delta)
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+
+class ReflectionEvent(NamedTuple):
+    kind: str
+    point: tuple[int, int]
+    fold_line: tuple[int, int]
+    reflected: tuple[int, int]
+
+# None while tracing is off, so hot paths only pay for a single `is not None` check
+events: list[ReflectionEvent] | None = None
+
+@contextmanager
+def tracing() -> Iterator[list[ReflectionEvent]]:
+    # Collects a ReflectionEvent for every cell each fold reflects. FoldEngine skips its FoldCache
+    # while tracing is on, so every fold is really computed and traced, cached or not.
+    global events
+    previous = events
+    events = []
+    try:
+        yield events
+    finally:
+        events = previous
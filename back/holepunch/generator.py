@@ -0,0 +1,161 @@
+import random
+from collections import OrderedDict
+from typing import Callable, Iterator, NamedTuple
+from .fold import Fold, DiagonalFold, HorizontalFold, VerticalFold
+from .fold_cache import FoldCache
+from .paper import Paper
+from .point import Point
+
+# Same fold set as ALL_FOLDS in front/src/pages/Game.jsx
+ALL_FOLDS: list[Fold] = [
+    VerticalFold(1.5, left_fold=True),
+    VerticalFold(1.5, left_fold=False),
+    VerticalFold(0.5, left_fold=True),
+    VerticalFold(0.5, left_fold=False),
+    VerticalFold(2.5, left_fold=True),
+    VerticalFold(2.5, left_fold=False),
+
+    HorizontalFold(1.5, downward=True),
+    HorizontalFold(1.5, downward=False),
+    HorizontalFold(0.5, downward=True),
+    HorizontalFold(0.5, downward=False),
+    HorizontalFold(2.5, downward=True),
+    HorizontalFold(2.5, downward=False),
+
+    DiagonalFold(Point(1, 0), Point(0, 1), left_fold=True),
+    DiagonalFold(Point(1, 0), Point(0, 1), left_fold=False),
+    DiagonalFold(Point(2, 0), Point(0, 2), left_fold=True),
+    DiagonalFold(Point(2, 0), Point(0, 2), left_fold=False),
+    DiagonalFold(Point(3, 0), Point(0, 3), left_fold=True),
+    DiagonalFold(Point(3, 0), Point(0, 3), left_fold=False),
+    DiagonalFold(Point(1, 3), Point(3, 1), left_fold=True),
+    DiagonalFold(Point(1, 3), Point(3, 1), left_fold=False),
+    DiagonalFold(Point(2, 3), Point(3, 2), left_fold=True),
+    DiagonalFold(Point(2, 3), Point(3, 2), left_fold=False),
+
+    DiagonalFold(Point(2, 0), Point(3, 1), left_fold=True),
+    DiagonalFold(Point(2, 0), Point(3, 1), left_fold=False),
+    DiagonalFold(Point(1, 0), Point(3, 2), left_fold=True),
+    DiagonalFold(Point(1, 0), Point(3, 2), left_fold=False),
+    DiagonalFold(Point(0, 0), Point(3, 3), left_fold=True),
+    DiagonalFold(Point(0, 0), Point(3, 3), left_fold=False),
+    DiagonalFold(Point(2, 3), Point(0, 1), left_fold=True),
+    DiagonalFold(Point(2, 3), Point(0, 1), left_fold=False),
+]
+
+class Puzzle(NamedTuple):
+    folds: tuple[int, ...]
+    punch: Point
+    holes: tuple[Point, ...]
+
+def sheet_symmetries(size: int) -> list[Callable[[int, int], tuple[int, int]]]:
+    # The 8 rotations and reflections of a size x size sheet, identity first
+    edge = size - 1
+    return [
+        lambda x, y: (x, y), lambda x, y: (edge - x, y), lambda x, y: (x, edge - y), lambda x, y: (edge - x, edge - y),
+        lambda x, y: (y, x), lambda x, y: (edge - y, x), lambda x, y: (y, edge - x), lambda x, y: (edge - y, edge - x),
+    ]
+
+def canonical_holes(holes: list[Point], size: int) -> tuple[tuple[int, int], ...]:
+    # Smallest sorted form of the hole pattern over the 8 rotations and reflections of the sheet
+    return min(tuple(sorted(symmetry(hole.x, hole.y) for hole in holes)) for symmetry in sheet_symmetries(size))
+
+class PuzzleGenerator:
+    # Fold sequences are indices into self.folds. Folded prefixes are kept in an LRU of max_prefixes
+    # entries, so sequences sharing a recent prefix only pay for the folds after it while a long run
+    # of samples stays in bounded memory.
+    def __init__(self, folds: list[Fold] = ALL_FOLDS, size: int = 4, cache: FoldCache | None = None, max_prefixes: int = 8192):
+        if max_prefixes < 1:
+            raise ValueError(f"Prefix cache size {max_prefixes} must be at least 1")
+        self.folds: list[Fold] = folds
+        self.size: int = size
+        # Different prefixes often fold into the same state, the cache lets them share the next fold
+        self.cache: FoldCache = cache if cache is not None else FoldCache()
+        self.max_prefixes: int = max_prefixes
+        self._sheet: Paper = Paper(size, self.cache)
+        self._prefixes: OrderedDict[tuple[int, ...], Paper | None] = OrderedDict()
+        self._next_folds: OrderedDict[tuple[int, ...], list[int]] = OrderedDict()
+        self._seen: set[tuple[tuple[int, int], ...]] = set()
+
+    def paper_for(self, sequence: tuple[int, ...]) -> Paper | None:
+        # The folded paper for a sequence, or None if any fold in it is invalid
+        if not sequence:
+            return self._sheet
+        if sequence in self._prefixes:
+            self._prefixes.move_to_end(sequence)
+            return self._prefixes[sequence]
+        parent = self.paper_for(sequence[:-1])
+        paper = None
+        if parent is not None and parent.check_fold_is_valid(self.folds[sequence[-1]]):
+            paper = parent.fork()
+            paper.add_fold(self.folds[sequence[-1]])
+        self._remember(self._prefixes, sequence, paper)
+        return paper
+
+    def _remember(self, entries: OrderedDict, sequence: tuple[int, ...], value):
+        entries[sequence] = value
+        if len(entries) > self.max_prefixes:
+            entries.popitem(last=False)
+
+    def valid_next_folds(self, sequence: tuple[int, ...]) -> list[int]:
+        next_folds = self._next_folds.get(sequence)
+        if next_folds is None:
+            paper = self.paper_for(sequence)
+            next_folds = [] if paper is None else [index for index, fold in enumerate(self.folds) if paper.check_fold_is_valid(fold)]
+            self._remember(self._next_folds, sequence, next_folds)
+        else:
+            self._next_folds.move_to_end(sequence)
+        return next_folds
+
+    def punch_points(self, paper: Paper) -> list[Point]:
+        return [Point(x, y) for (x, y) in paper.engine.positions() if 0 <= x < self.size and 0 <= y < self.size]
+
+    def _puzzle(self, sequence: tuple[int, ...], paper: Paper, punch: Point, unique: bool = True) -> Puzzle | None:
+        # Returns None when a puzzle with the same hole pattern, up to symmetry, was already produced
+        holes = paper.unfold([punch])[0]
+        if not unique:
+            return Puzzle(sequence, punch, tuple(holes))
+        key = canonical_holes(holes, self.size)
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        return Puzzle(sequence, punch, tuple(holes))
+
+    def enumerate(self, depth: int) -> Iterator[Puzzle]:
+        # Every distinct puzzle with exactly `depth` folds, invalid prefixes are never extended
+        def walk(sequence: tuple[int, ...]) -> Iterator[Puzzle]:
+            if len(sequence) == depth:
+                paper = self.paper_for(sequence)
+                for punch in self.punch_points(paper):
+                    puzzle = self._puzzle(sequence, paper, punch)
+                    if puzzle is not None:
+                        yield puzzle
+                return
+            for index in self.valid_next_folds(sequence):
+                yield from walk((*sequence, index))
+
+        yield from walk(())
+
+    def sample(self, count: int, min_folds: int = 2, max_folds: int = 3,
+               rng: random.Random | None = None, max_attempts: int = 10000, unique: bool = True) -> Iterator[Puzzle]:
+        # Random puzzles the way Game.jsx builds them, stops early after max_attempts duplicates in a row.
+        # With unique=False every sample is returned, repeats included.
+        rng = rng or random.Random()
+        produced = 0
+        attempts = 0
+        while produced < count and attempts < max_attempts:
+            attempts += 1
+            sequence: tuple[int, ...] = ()
+            for _ in range(rng.randint(min_folds, max_folds)):
+                next_folds = self.valid_next_folds(sequence)
+                if not next_folds:
+                    break
+                sequence = (*sequence, rng.choice(next_folds))
+            if len(sequence) < min_folds:
+                continue
+            paper = self.paper_for(sequence)
+            puzzle = self._puzzle(sequence, paper, rng.choice(self.punch_points(paper)), unique)
+            if puzzle is not None:
+                produced += 1
+                attempts = 0
+                yield puzzle
@@ -0,0 +1,258 @@
+import math
+from typing import NamedTuple
+import numpy as np
+from .fold import Fold, DiagonalFold
+from .fold_engine import MAX_FOLDS
+from .point import Point
+from . import profiling
+from .profiling import profiled
+
+# Fold engine for folds along any line, not just the grid lines and 45 degree diagonals of Fold.
+#
+# Every piece of the sheet is a convex polygon in the sheet's current (folded) coordinates, together
+# with the cell it was cut from, its stacking order and the affine map from unfolded to folded
+# coordinates. A fold is the half-plane normal . p > offset being reflected over its boundary line:
+# pieces whose bounding box lies on one side are kept or reflected as a whole, and only the pieces
+# whose bounding box straddles the line are clipped, all of them at once.
+#
+# Cell (x, y) is the unit square centred on (x, y), as in the grid engine. Layers follow the grid
+# engine too: bit k - 1 set means fold k laid the piece over the rest, and a piece reflected by fold
+# k has its layer mirrored with layer ^ (2**k - 1).
+
+class LineFold(NamedTuple):
+    # Folds the half-plane normal . p > offset over the line normal . p = offset, normal is a unit vector
+    normal: tuple[float, float]
+    offset: float
+
+    @classmethod
+    def through(cls, start: tuple[float, float], end: tuple[float, float]) -> 'LineFold':
+        # Folds what lies left of the directed line from start to end onto its right
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            raise ValueError("Fold line needs two distinct points")
+        normal = (-dy / length, dx / length)
+        return cls(normal, normal[0] * start[0] + normal[1] * start[1])
+
+    @classmethod
+    def from_fold(cls, fold: Fold) -> 'LineFold':
+        # The same fold as a grid Fold, which moves the cells whose reflection lands left of (or
+        # below) them when left_fold (or downward) is set
+        if fold.horizontal:
+            normal, offset = (0.0, 1.0), fold.fold_on
+        elif fold.vertical:
+            normal, offset = (1.0, 0.0), fold.fold_on
+        elif isinstance(fold, DiagonalFold):
+            slope, intercept = fold.fold_line
+            # Across y = slope * x + intercept a cell moves left exactly when x - slope * y + slope * intercept > 0
+            normal = (1 / math.sqrt(2), -slope / math.sqrt(2))
+            offset = -slope * intercept / math.sqrt(2)
+        else:
+            raise ValueError("Unknown fold type")
+        if not fold.left_fold:
+            normal, offset = (-normal[0], -normal[1]), -offset
+        return cls(normal, offset)
+
+class PieceState(NamedTuple):
+    # Pieces of the sheet at one fold step. vertices is (pieces, capacity, 2) with the first counts[i]
+    # rows of piece i used, transform is (pieces, 2, 3) mapping unfolded to folded coordinates.
+    vertices: np.ndarray
+    counts: np.ndarray
+    cell: np.ndarray
+    layer: np.ndarray
+    transform: np.ndarray
+    bounds: np.ndarray
+
+def _bounds(vertices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    valid = (np.arange(vertices.shape[1]) < counts[:, np.newaxis])[..., np.newaxis]
+    low = np.where(valid, vertices, np.inf).min(axis=1)
+    high = np.where(valid, vertices, -np.inf).max(axis=1)
+    return np.concatenate([low, high], axis=1)
+
+def _state(vertices: np.ndarray, counts: np.ndarray, cell: np.ndarray, layer: np.ndarray, transform: np.ndarray) -> PieceState:
+    return PieceState(vertices, counts, cell, layer, transform, _bounds(vertices, counts))
+
+def _pad(vertices: np.ndarray, capacity: int) -> np.ndarray:
+    if vertices.shape[1] >= capacity:
+        return vertices
+    return np.concatenate([vertices, np.zeros((len(vertices), capacity - vertices.shape[1], 2))], axis=1)
+
+def _concatenate(states: list[PieceState]) -> PieceState:
+    capacity = max(state.vertices.shape[1] for state in states)
+    return PieceState(
+        np.concatenate([_pad(state.vertices, capacity) for state in states]),
+        *(np.concatenate([state[field] for state in states]) for field in range(1, len(PieceState._fields))),
+    )
+
+def _take(state: PieceState, indices: np.ndarray) -> PieceState:
+    return PieceState(*(field[indices] for field in state))
+
+def _clip(vertices: np.ndarray, counts: np.ndarray, distance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Sutherland-Hodgman against one half-plane for every polygon at once, keeping distance <= 0.
+    # Every edge contributes its start vertex if kept, then its crossing point if it crosses the line.
+    pieces, capacity = distance.shape
+    index = np.arange(capacity)
+    valid = index < counts[:, np.newaxis]
+    following = (index + 1) % np.maximum(counts, 1)[:, np.newaxis]
+    next_distance = np.take_along_axis(distance, following, axis=1)
+    next_vertices = np.take_along_axis(vertices, following[..., np.newaxis], axis=1)
+
+    kept = valid & (distance <= 0)
+    crossing = valid & (distance * next_distance < 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(crossing, distance / (distance - next_distance), 0)
+    crossings = vertices + t[..., np.newaxis] * (next_vertices - vertices)
+
+    candidates = np.stack([vertices, crossings], axis=2).reshape(pieces, 2 * capacity, 2)
+    mask = np.stack([kept, crossing], axis=2).reshape(pieces, 2 * capacity)
+    # Stable sort moves the used slots to the front without reordering them
+    order = np.argsort(~mask, axis=1, kind="stable")
+    new_counts = mask.sum(axis=1)
+    new_capacity = max(int(new_counts.max(initial=0)), 1)
+    return np.take_along_axis(candidates, order[:, :new_capacity, np.newaxis], axis=1), new_counts
+
+def _area(vertices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    index = np.arange(vertices.shape[1])
+    following = np.where(index + 1 < counts[:, np.newaxis], index + 1, 0)
+    next_vertices = np.take_along_axis(vertices, following[..., np.newaxis], axis=1)
+    cross = vertices[..., 0] * next_vertices[..., 1] - vertices[..., 1] * next_vertices[..., 0]
+    return np.abs(np.where(index < counts[:, np.newaxis], cross, 0).sum(axis=1)) / 2
+
+class HalfPlaneEngine:
+    def __init__(self, size: int = 4, tolerance: float = 1e-9):
+        if size < 1:
+            raise ValueError(f"Grid size {size} must be at least 1")
+        self.size: int = size
+        # Distances within tolerance * size of a fold line count as on it
+        self.tolerance: float = tolerance * size
+        y, x = np.divmod(np.arange(size * size), size)
+        corners = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)])
+        vertices = np.column_stack((x, y)).astype(np.float64)[:, np.newaxis, :] + corners
+        identity = np.broadcast_to(np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]), (size * size, 2, 3)).copy()
+        self.states: list[PieceState] = [_state(vertices, np.full(size * size, 4), np.arange(size * size), np.zeros(size * size, dtype=np.int64), identity)]
+        self.folds: list[LineFold] = []
+        self._undone: list[tuple[LineFold, PieceState]] = []
+
+    @property
+    def steps(self) -> int:
+        return len(self.folds)
+
+    @property
+    def current(self) -> PieceState:
+        return self.states[-1]
+
+    def state_at(self, step: int) -> PieceState:
+        if step < 0 or step > self.steps:
+            raise ValueError(f"Fold index {step} is out of bounds")
+        return self.states[step]
+
+    def _sides(self, state: PieceState, fold: LineFold) -> tuple[np.ndarray, np.ndarray]:
+        # Bounding-box culling: the extreme signed distances of each piece's box from the fold line
+        normal_x, normal_y = fold.normal
+        low_x, low_y, high_x, high_y = state.bounds.T
+        farthest = np.where(normal_x > 0, high_x, low_x) * normal_x + np.where(normal_y > 0, high_y, low_y) * normal_y - fold.offset
+        nearest = np.where(normal_x > 0, low_x, high_x) * normal_x + np.where(normal_y > 0, low_y, high_y) * normal_y - fold.offset
+        return nearest, farthest
+
+    def _next_state(self, fold: LineFold) -> PieceState:
+        if isinstance(fold, Fold):
+            fold = LineFold.from_fold(fold)
+        step = self.steps
+        if step + 1 >= MAX_FOLDS:
+            raise ValueError(f"A sheet can be folded at most {MAX_FOLDS - 1} times")
+        state = self.current
+        nearest, farthest = self._sides(state, fold)
+        staying = farthest <= self.tolerance
+        moving = ~staying & (nearest >= -self.tolerance)
+        straddling = np.flatnonzero(~staying & ~moving)
+        if profiling.current is not None:
+            profiling.current.count("pieces kept whole", int(staying.sum()))
+            profiling.current.count("pieces reflected whole", int(moving.sum()))
+            profiling.current.count("pieces clipped", len(straddling))
+
+        stay_parts, move_parts = [_take(state, np.flatnonzero(staying))], [_take(state, np.flatnonzero(moving))]
+        if len(straddling):
+            pieces = _take(state, straddling)
+            distance = pieces.vertices @ np.array(fold.normal) - fold.offset
+            distance = np.where(np.abs(distance) <= self.tolerance, 0, distance)
+            for parts, sign in ((stay_parts, 1), (move_parts, -1)):
+                vertices, counts = _clip(pieces.vertices, pieces.counts, sign * distance)
+                # Slivers left over from a piece that only touched the line are dropped
+                kept = np.flatnonzero((counts >= 3) & (_area(vertices, counts) > self.tolerance))
+                parts.append(_take(_state(vertices, counts, pieces.cell, pieces.layer, pieces.transform), kept))
+
+        staying_state, moving_state = _concatenate(stay_parts), _concatenate(move_parts)
+        normal = np.array(fold.normal)
+        reflection = np.eye(2) - 2 * np.outer(normal, normal)
+        translation = 2 * fold.offset * normal
+        moved_vertices = moving_state.vertices @ reflection.T + translation
+        moved_transform = reflection @ moving_state.transform
+        moved_transform[:, :, 2] += translation
+        moved = _state(moved_vertices, moving_state.counts, moving_state.cell, moving_state.layer ^ (2**(step + 1) - 1), moved_transform)
+        return _concatenate([staying_state, moved])
+
+    @profiled("HalfPlaneEngine.apply")
+    def apply(self, fold: LineFold | Fold):
+        state = self._next_state(fold)
+        self.folds.append(fold if isinstance(fold, LineFold) else LineFold.from_fold(fold))
+        self.states.append(state)
+        self._undone = []
+
+    def can_fold(self, fold: LineFold | Fold) -> bool:
+        # Something has to move for the fold to count
+        fold = fold if isinstance(fold, LineFold) else LineFold.from_fold(fold)
+        _, farthest = self._sides(self.current, fold)
+        return bool((farthest > self.tolerance).any())
+
+    def undo(self) -> LineFold:
+        if not self.folds:
+            raise IndexError("No fold to undo")
+        fold, state = self.folds.pop(), self.states.pop()
+        self._undone.append((fold, state))
+        return fold
+
+    def redo(self) -> LineFold:
+        if not self._undone:
+            raise IndexError("No fold to redo")
+        fold, state = self._undone.pop()
+        self.folds.append(fold)
+        self.states.append(state)
+        return fold
+
+    def pieces_at(self, point: tuple[float, float], step: int | None = None) -> np.ndarray:
+        # Indices of the pieces covering a point of the folded sheet, edges included
+        state = self.current if step is None else self.state_at(step)
+        x, y = point
+        low_x, low_y, high_x, high_y = state.bounds.T
+        candidates = np.flatnonzero((low_x - self.tolerance <= x) & (x <= high_x + self.tolerance) & (low_y - self.tolerance <= y) & (y <= high_y + self.tolerance))
+        vertices, counts = state.vertices[candidates], state.counts[candidates]
+        index = np.arange(vertices.shape[1])
+        following = np.where(index + 1 < counts[:, np.newaxis], index + 1, 0)
+        edges = np.take_along_axis(vertices, following[..., np.newaxis], axis=1) - vertices
+        cross = edges[..., 0] * (y - vertices[..., 1]) - edges[..., 1] * (x - vertices[..., 0])
+        valid = index < counts[:, np.newaxis]
+        # Reflected pieces wind clockwise, so inside is on the same side of every edge either way
+        inside = (np.where(valid, cross, 0) >= -self.tolerance).all(axis=1) | (np.where(valid, cross, 0) <= self.tolerance).all(axis=1)
+        return candidates[inside]
+
+    def unfold(self, points: list[tuple[float, float]]) -> list[list[tuple[float, float]]]:
+        # Where a punch at each point of the folded sheet ends up on the unfolded sheet
+        state = self.current
+        holes = []
+        for point in points:
+            pieces = self.pieces_at(point)
+            transform = state.transform[pieces]
+            # The linear part is orthogonal, so its inverse is its transpose
+            unfolded = np.einsum("nji,nj->ni", transform[:, :, :2], np.asarray(point, dtype=np.float64) - transform[:, :, 2])
+            holes.append(sorted({(round(float(x), 9) + 0.0, round(float(y), 9) + 0.0) for x, y in unfolded.tolist()}))
+        return holes
+
+    def unfold_cells(self, points: list[Point]) -> list[list[int]]:
+        # Cells a punch at each point goes through, like FoldEngine.unfold
+        return [sorted(set(self.current.cell[self.pieces_at((point.x, point.y))].tolist())) for point in points]
+
+    def polygons(self, step: int | None = None) -> list[tuple[int, int, np.ndarray]]:
+        # (cell, layer, vertices) of every piece, e.g. for drawing
+        state = self.current if step is None else self.state_at(step)
+        return [(cell, layer, vertices[:count]) for cell, layer, vertices, count in
+                zip(state.cell.tolist(), state.layer.tolist(), state.vertices, state.counts.tolist())]
@@ -0,0 +1,35 @@
+from enum import Enum
+
+
+class Orientation(Enum):
+    TOP_LEFT = "top_left"
+    TOP_RIGHT = "top_right"
+    BOTTOM_LEFT = "bottom_left"
+    BOTTOM_RIGHT = "bottom_right"
+
+    def vertical_flip(self):
+        return _VERTICAL_FLIPS[self]
+        
+    def horizontal_flip(self):
+        return _HORIZONTAL_FLIPS[self]
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"Orientation.{self.name}"
+
+
+_VERTICAL_FLIPS = {
+    Orientation.TOP_LEFT: Orientation.TOP_RIGHT,
+    Orientation.TOP_RIGHT: Orientation.TOP_LEFT,
+    Orientation.BOTTOM_LEFT: Orientation.BOTTOM_RIGHT,
+    Orientation.BOTTOM_RIGHT: Orientation.BOTTOM_LEFT,
+}
+
+_HORIZONTAL_FLIPS = {
+    Orientation.TOP_LEFT: Orientation.BOTTOM_LEFT,
+    Orientation.TOP_RIGHT: Orientation.BOTTOM_RIGHT,
+    Orientation.BOTTOM_LEFT: Orientation.TOP_LEFT,
+    Orientation.BOTTOM_RIGHT: Orientation.TOP_RIGHT,
+}
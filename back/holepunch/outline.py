@@ -0,0 +1,81 @@
+import numpy as np
+from .fold_engine import ORIENTATION_CODES
+from .fold_history import FoldState
+from .orientation import Orientation
+
+# Exact outline of a folded sheet. Every cell is split into four quarter triangles around its
+# centre, a whole cell covers all four and a halved cell covers the two on its side of the
+# diagonal. The quarters covered at each position are OR-ed together, then the directed edges of
+# every covered quarter are added with edges shared by two quarters cancelling out, which leaves
+# exactly the boundary of the union in time linear in the number of cells.
+#
+# Coordinates are doubled while tracing so cell corners (x +- 0.5, y +- 0.5) stay integers.
+
+BOTTOM, RIGHT, TOP, LEFT = 1, 2, 4, 8
+WHOLE = BOTTOM | RIGHT | TOP | LEFT
+
+_HALF_QUARTERS = np.zeros(len(ORIENTATION_CODES), dtype=np.int64)
+_HALF_QUARTERS[ORIENTATION_CODES[Orientation.TOP_LEFT]] = TOP | LEFT
+_HALF_QUARTERS[ORIENTATION_CODES[Orientation.TOP_RIGHT]] = TOP | RIGHT
+_HALF_QUARTERS[ORIENTATION_CODES[Orientation.BOTTOM_LEFT]] = BOTTOM | LEFT
+_HALF_QUARTERS[ORIENTATION_CODES[Orientation.BOTTOM_RIGHT]] = BOTTOM | RIGHT
+
+def _quarter_edges(x: int, y: int, quarters: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    # Counter-clockwise edges of the covered quarters of the cell centred on (x, y), in doubled coordinates
+    centre = (2 * x, 2 * y)
+    bottom_left, bottom_right = (2 * x - 1, 2 * y - 1), (2 * x + 1, 2 * y - 1)
+    top_left, top_right = (2 * x - 1, 2 * y + 1), (2 * x + 1, 2 * y + 1)
+    edges = []
+    for quarter, start, end in (
+        (BOTTOM, bottom_left, bottom_right),
+        (RIGHT, bottom_right, top_right),
+        (TOP, top_right, top_left),
+        (LEFT, top_left, bottom_left),
+    ):
+        if quarters & quarter:
+            edges += [(start, end), (end, centre), (centre, start)]
+    return edges
+
+def _is_straight(previous: tuple[int, int], vertex: tuple[int, int], following: tuple[int, int]) -> bool:
+    first = (vertex[0] - previous[0], vertex[1] - previous[1])
+    second = (following[0] - vertex[0], following[1] - vertex[1])
+    return first[0] * second[1] == first[1] * second[0] and first[0] * second[0] + first[1] * second[1] > 0
+
+def trace_outline(state: FoldState) -> list[list[tuple[float, float]]]:
+    # Boundary loops of the cells in state, outer boundaries counter-clockwise and holes
+    # clockwise, without repeating the first vertex at the end
+    quarters = np.where(state.halved_at > 0, _HALF_QUARTERS[state.orientation], WHOLE)
+    covered: dict[tuple[int, int], int] = {}
+    for x, y, cell_quarters in zip(state.x.tolist(), state.y.tolist(), quarters.tolist()):
+        covered[(x, y)] = covered.get((x, y), 0) | cell_quarters
+
+    edges: set[tuple[tuple[int, int], tuple[int, int]]] = set()
+    for (x, y), cell_quarters in covered.items():
+        for start, end in _quarter_edges(x, y, cell_quarters):
+            if (end, start) in edges:
+                edges.remove((end, start))
+            else:
+                edges.add((start, end))
+
+    outgoing: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for start, end in sorted(edges, reverse=True):
+        outgoing.setdefault(start, []).append(end)
+
+    loops = []
+    while outgoing:
+        start = min(outgoing, key=lambda vertex: (vertex[1], vertex[0]))
+        loop = [start]
+        vertex = start
+        while True:
+            ends = outgoing[vertex]
+            following = ends.pop()
+            if not ends:
+                del outgoing[vertex]
+            if following == start:
+                break
+            loop.append(following)
+            vertex = following
+        # Merge runs of collinear edges into one edge
+        loop = [vertex for index, vertex in enumerate(loop) if not _is_straight(loop[index - 1], vertex, loop[(index + 1) % len(loop)])]
+        loops.append([(x / 2, y / 2) for x, y in loop])
+    return loops
@@ -0,0 +1,138 @@
+import logging
+from .cell import Cell, CellRepresentation, CellView
+from .point import Point
+from .fold import Fold
+from .fold_engine import FoldEngine
+from .fold_cache import FoldCache
+from .outline import trace_outline
+from .profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+class Paper:
+    def __init__(self, size: int = 4, cache: FoldCache | None = None):
+        self.size: int = size
+        self.folds: list[Fold] = []
+        self.punches: list[Point] = []
+        self.engine: FoldEngine = FoldEngine(size, cache)
+        self._undone_folds: list[Fold] = []
+        self._cells: dict[Point, Cell] | None = None
+        self._outlines: dict[int, list[list[tuple[float, float]]]] = {}
+
+    @property
+    def cells(self) -> dict[Point, Cell]:
+        # Built on first use, so forks that are only folded and punched never allocate per-cell objects
+        if self._cells is None:
+            self._cells = {Point(x, y): CellView(Point(x, y), self.engine, y * self.size + x) for y in range(self.size) for x in range(self.size)}
+        return self._cells
+
+    @property
+    def layers(self) -> list[list[list[Cell]]]:
+        return [[list(self.cells.values())]] + [[] for _ in self.folds]
+
+    @profiled("Paper.add_fold")
+    def add_fold(self, fold: Fold):
+        if not isinstance(fold, Fold):
+            raise TypeError("Fold must be an instance of Fold class")
+        self._validate_fold(fold)
+        self.folds.append(fold)
+        self._undone_folds = []
+        logger.debug("Adding fold: %s", fold)
+        self._perform_fold(fold)
+        logger.debug("Fold performed: %s", fold)
+
+    @profiled("Paper.undo_fold")
+    def undo_fold(self) -> Fold:
+        if not self.folds:
+            raise IndexError("No fold to undo")
+        fold = self.folds.pop()
+        self._undone_folds.append(fold)
+        self.engine.undo()
+        self._outlines.pop(len(self.folds) + 1, None)
+        return fold
+
+    @profiled("Paper.redo_fold")
+    def redo_fold(self) -> Fold:
+        if not self._undone_folds:
+            raise IndexError("No fold to redo")
+        fold = self._undone_folds.pop()
+        self.folds.append(fold)
+        self.engine.redo()
+        return fold
+
+    @profiled("Paper.fork")
+    def fork(self) -> 'Paper':
+        # Independent copy that shares the fold history recorded so far instead of replaying it
+        paper = Paper.__new__(Paper)
+        paper.size = self.size
+        paper.folds = list(self.folds)
+        paper.punches = list(self.punches)
+        paper.engine = self.engine.fork()
+        paper._undone_folds = list(self._undone_folds)
+        paper._cells = None
+        paper._outlines = dict(self._outlines)
+        return paper
+
+    def state_hash(self) -> bytes:
+        return self.engine.state_hash()
+
+    @profiled("Paper.check_fold_is_valid")
+    def check_fold_is_valid(self, fold: Fold) -> bool:
+        if not isinstance(fold, Fold):
+            raise TypeError("Fold must be an instance of Fold class")
+        try:
+            self._validate_fold(fold)
+        except ValueError:
+            return False
+        return self.engine.can_fold(fold)
+
+    def _validate_fold(self, fold: Fold):
+        if (fold.horizontal or fold.vertical) and not 0 <= fold.fold_on <= self.size - 1:
+            raise ValueError(f"Fold line {fold.fold_on} must be between 0 and {self.size - 1}")
+
+    def _perform_fold(self, fold: Fold):
+        self.engine.apply(fold)
+
+    @profiled("Paper.punch")
+    def punch(self, point: Point):
+        self.punches.append(point)
+        self.engine.punch(point)
+
+    @profiled("Paper.unfold")
+    def unfold(self, punches: list[Point]) -> list[list[Point]]:
+        # Where the holes end up on the unfolded sheet for each punch, without punching the paper
+        return [[Point(index % self.size, index // self.size) for index in holes] for holes in self.engine.unfold(punches)]
+
+    def __str__(self):
+        for y in range(self.size):
+            for x in range(self.size):
+                cell = self.cells[Point(x, y)]
+                if cell.is_punched:
+                    print("X", end=" | ")
+                else:
+                    print(" ", end=" | ")
+            print()
+        return ""
+
+    @profiled("Paper.get_cells_at_fold")
+    def get_cells_at_fold(self, fold_index: int) -> dict[Point, list[tuple[bool, CellRepresentation]]]:
+        if fold_index < 0 or fold_index >= len(self.folds) + 1:
+            raise ValueError(f"Fold index {fold_index} is out of bounds")
+        return self.engine.cells_at(fold_index)
+
+    @profiled("Paper.get_visible_cells")
+    def get_visible_cells(self, fold_index: int) -> list[Cell]:
+        if fold_index < 0 or fold_index >= len(self.folds) + 1:
+            raise ValueError(f"Fold index {fold_index} is out of bounds")
+        cells = list(self.cells.values())
+        return [cells[index] for index in self.engine.visible_cells(fold_index).tolist()]
+
+    @profiled("Paper.get_outline")
+    def get_outline(self, fold_index: int) -> list[list[tuple[float, float]]]:
+        if fold_index < 0 or fold_index >= len(self.folds) + 1:
+            raise ValueError(f"Fold index {fold_index} is out of bounds")
+        if fold_index not in self._outlines:
+            # Outline of the top layer, the part of the folded sheet that is seen from above
+            state = self.engine.history.state_at(fold_index)
+            self._outlines[fold_index] = trace_outline(state.take(self.engine.visible_cells(fold_index)))
+        return self._outlines[fold_index]
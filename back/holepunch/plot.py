@@ -0,0 +1,63 @@
+import matplotlib.pyplot as plt
+from .cell import CellRepresentation
+from .fold import Fold, DiagonalFold
+from .orientation import Orientation
+from .paper import Paper
+from .point import Point
+
+# matplotlib drawing of folds, cells and outlines. Not imported by the holepunch package itself,
+# so nothing else pays for matplotlib unless it draws.
+
+def display_fold(fold: Fold, axis):
+    if fold.horizontal:
+        axis.axhline(y=fold.fold_line[1], color='grey', linestyle='-', label='Horizontal Fold')
+    elif fold.vertical:
+        axis.axvline(x=fold.fold_line[1], color='grey', linestyle='-', label='Vertical Fold')
+    elif isinstance(fold, DiagonalFold):
+        if fold.fold_line[0] < 0:
+            # Negative slope diagonal fold
+            x_values = [fold.start.x + 0.5, fold.end.x - 0.5]
+            y_values = [fold.start.y - 0.5, fold.end.y + 0.5]
+        else:
+            # Positive slope diagonal fold
+            x_values = [fold.start.x - 0.5, fold.end.x + 0.5]
+            y_values = [fold.start.y + 0.5, fold.end.y - 0.5]
+        axis.plot(x_values, y_values, color='grey', linestyle='-', label='Diagonal Fold')
+    else:
+        raise ValueError("Unknown fold type")
+
+def display_paper(cells: dict[Point, list[tuple[bool, CellRepresentation]]], axis, show_punched: bool=False, size: int = 4):
+    # Draws the cells of one fold step, with the axes fitted to a size x size sheet
+    opacity = 1
+    first_point = next(iter(cells), None)
+    for point, cell_reps in cells.items():
+        for is_punched, cell in cell_reps:
+            if cell.is_halved:
+                if cell.orientation == Orientation.TOP_LEFT:
+                    triangle = plt.Polygon([(point.x - 0.5, point.y + 0.5), (point.x + 0.5, point.y + 0.5), (point.x - 0.5, point.y - 0.5)], color='lightgray', alpha=min(1, opacity * 2), label='Halved' if point == first_point else "")
+                elif cell.orientation == Orientation.TOP_RIGHT:
+                    triangle = plt.Polygon([(point.x + 0.5, point.y + 0.5), (point.x - 0.5, point.y + 0.5), (point.x + 0.5, point.y - 0.5)], color='lightgray', alpha=min(1, opacity * 2), label='Halved' if point == first_point else "")
+                elif cell.orientation == Orientation.BOTTOM_LEFT:
+                    triangle = plt.Polygon([(point.x - 0.5, point.y - 0.5), (point.x + 0.5, point.y - 0.5), (point.x - 0.5, point.y + 0.5)], color='lightgray', alpha=min(1, opacity * 2), label='Halved' if point == first_point else "")
+                elif cell.orientation == Orientation.BOTTOM_RIGHT:
+                    triangle = plt.Polygon([(point.x - 0.5, point.y - 0.5), (point.x + 0.5, point.y - 0.5), (point.x + 0.5, point.y + 0.5)], color='lightgray', alpha=min(1, opacity * 2), label='Halved' if point == first_point else "")
+                axis.add_patch(triangle)
+            else:
+                rect = plt.Rectangle((point.x - 0.5, point.y - 0.5), 1, 1, color='lightgray', alpha=opacity)
+                axis.add_patch(rect)
+            if is_punched and show_punched:
+                hole = plt.Circle((point.x, point.y), 0.1, color='red', label='Punched' if point == first_point else "")
+                axis.add_patch(hole)
+
+    axis.set_xlim(-0.5, size - 0.5)
+    axis.set_ylim(-0.5, size - 0.5)
+    axis.set_xticks(range(size))
+    axis.set_yticks(range(size))
+    axis.set_title("Paper Folding Visualization")
+    axis.set_xlabel("X-axis")
+
+def trace_outline(axis, fold_index: int, paper: Paper):
+    for loop_index, loop in enumerate(paper.get_outline(fold_index)):
+        x_values = [point[0] for point in loop] + [loop[0][0]]
+        y_values = [point[1] for point in loop] + [loop[0][1]]
+        axis.plot(x_values, y_values, marker='', color='black', linestyle='-', label=f'Outline at Fold {fold_index}' if loop_index == 0 else "")
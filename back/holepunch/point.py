@@ -0,0 +1,63 @@
+import logging
+from . import fold_trace
+from .fold_trace import ReflectionEvent
+
+logger = logging.getLogger(__name__)
+
+# Coordinates interned by Point, wide enough for the sheets the service accepts at the usual sizes
+# and the off-sheet reflections checked while validating folds, while bounding the cache
+_INTERNED = range(-64, 128)
+
+class Point:
+    # Points are immutable, and interned inside _INTERNED so every (x, y) on the grid is allocated
+    # once and shared, points further out are built on every call
+    __slots__ = ("x", "y", "_hash")
+    _cache: dict[tuple[int, int], 'Point'] = {}
+
+    x: int
+    y: int
+
+    def __new__(cls, x: int, y: int) -> 'Point':
+        key = (int(x), int(y))
+        point = cls._cache.get(key)
+        if point is None:
+            point = object.__new__(cls)
+            object.__setattr__(point, "x", key[0])
+            object.__setattr__(point, "y", key[1])
+            object.__setattr__(point, "_hash", hash(key))
+            if key[0] in _INTERNED and key[1] in _INTERNED:
+                cls._cache[key] = point
+        return point
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Point is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Point is immutable")
+
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
+
+    def reflect_point(self, fold: 'Fold') -> 'Point':
+        reflected = fold.reflect(self)
+        kind = "horizontal" if fold.horizontal else "vertical" if fold.vertical else "diagonal"
+        logger.debug("Reflecting point %s across %s fold line %s results in reflected point %s", self, kind, fold.fold_line, reflected)
+        if fold_trace.events is not None:
+            fold_trace.events.append(ReflectionEvent(kind, (self.x, self.y), fold.fold_line, (reflected.x, reflected.y)))
+        return reflected
+
+    def __hash__(self):
+        return self._hash
+    
+    def __str__(self):
+        return f"Point({self.x}, {self.y})"
+    
+    def __repr__(self):
+        return f"Point({self.x}, {self.y})"
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, Point):
+            return self.x == other.x and self.y == other.y
+        return False
\ No newline at end of file
@@ -0,0 +1,105 @@
+import functools
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+# Opt-in timers and counters for Paper operations and fold application, in the style of fold_trace:
+#
+#   with profiling.profiling() as profile:
+#       paper.add_fold(fold)
+#       paper.punch(point)
+#   print(profile.report())
+#   profile.write_folded("paper.folded")  # flamegraph.pl paper.folded > paper.svg, or speedscope
+#
+# Timed operations nest, so a profile keeps the time spent in each stack of operations and reports
+# both inclusive totals per operation and exclusive (self) time per stack, which is what flamegraph
+# tools expect.
+
+class Profile:
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        # operation -> [calls, inclusive ns, slowest call ns]
+        self.timers: dict[str, list[int]] = {}
+        # stack of operations -> exclusive ns
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stack: list[str] = []
+        self._starts: list[int] = []
+        self._children: list[int] = []
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def enter(self, name: str):
+        self._stack.append(name)
+        self._children.append(0)
+        self._starts.append(time.perf_counter_ns())
+
+    def exit(self):
+        elapsed = time.perf_counter_ns() - self._starts.pop()
+        children = self._children.pop()
+        self.stacks[tuple(self._stack)] += elapsed - children
+        name = self._stack.pop()
+        timer = self.timers.setdefault(name, [0, 0, 0])
+        timer[0] += 1
+        timer[1] += elapsed
+        timer[2] = max(timer[2], elapsed)
+        if self._children:
+            self._children[-1] += elapsed
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def report(self) -> str:
+        lines = [f"{'operation':<40}{'calls':>10}{'total ms':>12}{'mean us':>12}{'max us':>12}"]
+        for name, (calls, total, slowest) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<40}{calls:>10}{total / 1e6:>12.3f}{total / calls / 1e3:>12.1f}{slowest / 1e3:>12.1f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<40}{'value':>10}")
+            lines.extend(f"{name:<40}{value:>10}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def to_folded(self) -> str:
+        # Folded stacks ("outer;inner self_microseconds" per line) for flamegraph.pl, inferno or speedscope
+        return "\n".join(f"{';'.join(stack)} {max(round(ns / 1e3), 1)}" for stack, ns in sorted(self.stacks.items())) + "\n"
+
+    def write_folded(self, path: str):
+        with open(path, "w") as folded_file:
+            folded_file.write(self.to_folded())
+
+# None while profiling is off, the same switch as fold_trace.events
+current: Profile | None = None
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    global current
+    previous = current
+    current = Profile()
+    try:
+        yield current
+    finally:
+        current = previous
+
+Function = TypeVar("Function", bound=Callable)
+
+def profiled(name: str) -> Callable[[Function], Function]:
+    # Times every call of the decorated function under `name` while profiling is on
+    def decorate(function: Function) -> Function:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = current
+            if profile is None:
+                return function(*args, **kwargs)
+            profile.enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.exit()
+        return wrapper
+    return decorate
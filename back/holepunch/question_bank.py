@@ -0,0 +1,103 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from .binary_format import write_bank
+from .generator import PuzzleGenerator, Puzzle
+from .paper import Paper
+
+# Builds a question bank of (fold sequence, punch, answer) records as sharded files.
+# Shard i is generated from its own seed derived from (seed, i), so the output for a seed is the
+# same however many workers split the shards between them. Shards are JSONL, or with --format binary
+# the memory-mapped bank files of binary_format.
+#
+#   python -m holepunch.question_bank --count 1000000 --shard-size 50000 --seed 7 --workers 8 --output bank/
+
+_generator: PuzzleGenerator | None = None
+
+def shard_seed(seed: int, shard: int) -> str:
+    # random.Random hashes str seeds with SHA-512, unlike hash(), so this is stable across processes
+    return f"{seed}:{shard}"
+
+def puzzle_to_json(puzzle: Puzzle, generator: PuzzleGenerator) -> str:
+    return json.dumps({
+        "folds": [generator.folds[index].to_dict() for index in puzzle.folds],
+        "punch": [puzzle.punch.x, puzzle.punch.y],
+        "holes": [[hole.x, hole.y] for hole in puzzle.holes],
+    })
+
+def puzzle_to_paper(puzzle: Puzzle) -> Paper:
+    # A punched fork, the generator's cached prefix paper stays unpunched
+    paper = _generator.paper_for(puzzle.folds).fork()
+    paper.punch(puzzle.punch)
+    return paper
+
+def build_shard(shard: int, count: int, seed: int, output: str, min_folds: int, max_folds: int,
+                shard_format: str = "jsonl") -> tuple[int, int, int, float]:
+    global _generator
+    if _generator is None:
+        # One generator per worker process, so its prefix cache is shared by every shard it builds.
+        # The cache is an LRU, so a worker's memory stays bounded however many shards it builds.
+        _generator = PuzzleGenerator()
+    start = time.perf_counter()
+    rng = random.Random(shard_seed(seed, shard))
+    puzzles = _generator.sample(count, min_folds=min_folds, max_folds=max_folds, rng=rng, unique=False)
+    if shard_format == "binary":
+        written = write_bank(os.path.join(output, f"shard-{shard:05d}.hpb"), map(puzzle_to_paper, puzzles))
+    else:
+        written = 0
+        with open(os.path.join(output, f"shard-{shard:05d}.jsonl"), "w") as shard_file:
+            for puzzle in puzzles:
+                shard_file.write(puzzle_to_json(puzzle, _generator))
+                shard_file.write("\n")
+                written += 1
+    return shard, os.getpid(), written, time.perf_counter() - start
+
+def build_bank(count: int, shard_size: int, seed: int, workers: int, output: str,
+               min_folds: int = 2, max_folds: int = 3, shard_format: str = "jsonl") -> dict[int, tuple[int, float]]:
+    os.makedirs(output, exist_ok=True)
+    shards = math.ceil(count / shard_size)
+    sizes = [min(shard_size, count - shard * shard_size) for shard in range(shards)]
+    per_worker: dict[int, tuple[int, float]] = defaultdict(lambda: (0, 0.0))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            build_shard,
+            range(shards),
+            sizes,
+            [seed] * shards,
+            [output] * shards,
+            [min_folds] * shards,
+            [max_folds] * shards,
+            [shard_format] * shards,
+        )
+        for shard, pid, written, elapsed in results:
+            puzzles, seconds = per_worker[pid]
+            per_worker[pid] = (puzzles + written, seconds + elapsed)
+    return dict(per_worker)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a sharded JSONL question bank")
+    parser.add_argument("--count", type=int, required=True, help="Total number of puzzles")
+    parser.add_argument("--shard-size", type=int, default=100000, help="Puzzles per shard file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="question_bank")
+    parser.add_argument("--min-folds", type=int, default=2)
+    parser.add_argument("--max-folds", type=int, default=3)
+    parser.add_argument("--format", choices=["jsonl", "binary"], default="jsonl", help="Shard file format")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    per_worker = build_bank(args.count, args.shard_size, args.seed, args.workers, args.output, args.min_folds, args.max_folds, args.format)
+    elapsed = time.perf_counter() - start
+
+    for worker, (puzzles, seconds) in sorted(per_worker.items()):
+        print(f"worker {worker}: {puzzles} puzzles in {seconds:.2f}s ({puzzles / seconds:.0f} puzzles/sec)")
+    print(f"total: {args.count} puzzles in {elapsed:.2f}s ({args.count / elapsed:.0f} puzzles/sec)")
+
+if __name__ == "__main__":
+    main()
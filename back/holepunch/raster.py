@@ -0,0 +1,128 @@
+import os
+import struct
+import zlib
+from typing import Iterable
+import numpy as np
+from .fold_engine import ORIENTATION_CODES
+from .fold_history import FoldState
+from .orientation import Orientation
+from .paper import Paper
+
+# Headless counterpart of plot.display_paper: draws a fold step straight from the FoldEngine state
+# into a NumPy image, without matplotlib. Every cell stamps a precomputed square, triangle or hole
+# mask into its block of the image, and overlapping layers stack their alpha. Both rasterize and
+# to_svg only draw cells that lie on the sheet, like display_paper's axis limits.
+
+BACKGROUND = np.array([255, 255, 255], dtype=np.float64)
+PAPER = np.array([211, 211, 211], dtype=np.float64)  # matplotlib's lightgray
+HOLE = np.array([255, 0, 0], dtype=np.float64)
+HOLE_RADIUS = 0.1
+
+SQUARE = len(ORIENTATION_CODES)
+
+def _masks(scale: int) -> tuple[np.ndarray, np.ndarray]:
+    # Pixel-centre coverage of one cell, indexed by orientation code for halved cells and SQUARE for
+    # whole ones. u runs left to right and r top to bottom within the cell.
+    u = (np.arange(scale) + 0.5) / scale
+    r = u[:, np.newaxis]
+    masks = np.empty((SQUARE + 1, scale, scale), dtype=np.float64)
+    masks[ORIENTATION_CODES[Orientation.TOP_LEFT]] = u + r <= 1
+    masks[ORIENTATION_CODES[Orientation.TOP_RIGHT]] = u >= r
+    masks[ORIENTATION_CODES[Orientation.BOTTOM_LEFT]] = u <= r
+    masks[ORIENTATION_CODES[Orientation.BOTTOM_RIGHT]] = u + r >= 1
+    masks[SQUARE] = 1
+    hole = ((u - 0.5)**2 + (r - 0.5)**2 <= HOLE_RADIUS**2).astype(np.float64)
+    return masks, hole
+
+def _on_sheet(state: FoldState, size: int) -> np.ndarray:
+    return (state.x >= 0) & (state.x < size) & (state.y >= 0) & (state.y < size)
+
+def rasterize(paper: Paper, fold_index: int, scale: int = 32, show_punched: bool = False, layer_alpha: float = 0.5) -> np.ndarray:
+    # (size * scale, size * scale, 3) uint8 RGB image of the paper at a fold step, y pointing up
+    if fold_index < 0 or fold_index >= len(paper.folds) + 1:
+        raise ValueError(f"Fold index {fold_index} is out of bounds")
+    size = paper.size
+    state = paper.engine.history.state_at(fold_index)
+    masks, hole = _masks(scale)
+
+    inside = _on_sheet(state, size)
+    rows = size - 1 - state.y[inside]
+    columns = state.x[inside]
+    kinds = np.where(state.halved_at[inside] > 0, state.orientation[inside], SQUARE)
+
+    # Number of layers covering each pixel, laid out per cell block and flattened afterwards
+    layers = np.zeros((size, size, scale, scale), dtype=np.float64)
+    np.add.at(layers, (rows, columns), masks[kinds])
+    coverage = 1 - (1 - layer_alpha)**layers
+    image = BACKGROUND + (PAPER - BACKGROUND) * coverage[..., np.newaxis]
+
+    if show_punched:
+        punched = paper.engine.punched[inside]
+        holes = np.zeros((size, size), dtype=bool)
+        holes[rows[punched], columns[punched]] = True
+        hole_pixels = (holes[:, :, np.newaxis, np.newaxis] * hole)[..., np.newaxis]
+        image = image * (1 - hole_pixels) + HOLE * hole_pixels
+
+    image = image.transpose(0, 2, 1, 3, 4).reshape(size * scale, size * scale, 3)
+    return np.round(image).astype(np.uint8)
+
+def encode_png(image: np.ndarray) -> bytes:
+    height, width, _ = image.shape
+    # Filter type 0 (none) on every scanline
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)], axis=1).tobytes()
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+_SVG_SHAPES = {
+    ORIENTATION_CODES[Orientation.TOP_LEFT]: "0,0 1,0 0,1",
+    ORIENTATION_CODES[Orientation.TOP_RIGHT]: "0,0 1,0 1,1",
+    ORIENTATION_CODES[Orientation.BOTTOM_LEFT]: "0,0 0,1 1,1",
+    ORIENTATION_CODES[Orientation.BOTTOM_RIGHT]: "1,0 1,1 0,1",
+    SQUARE: "0,0 1,0 1,1 0,1",
+}
+
+def to_svg(paper: Paper, fold_index: int, show_punched: bool = False, layer_alpha: float = 0.5) -> str:
+    # Same picture as rasterize, in cell units with one polygon per cell
+    if fold_index < 0 or fold_index >= len(paper.folds) + 1:
+        raise ValueError(f"Fold index {fold_index} is out of bounds")
+    size = paper.size
+    state = paper.engine.history.state_at(fold_index)
+    inside = _on_sheet(state, size)
+    kinds = np.where(state.halved_at > 0, state.orientation, SQUARE)[inside]
+    elements = []
+    holes = set()
+    for x, y, kind, punched in zip(state.x[inside].tolist(), state.y[inside].tolist(), kinds.tolist(), paper.engine.punched[inside].tolist()):
+        row = size - 1 - y
+        elements.append(f'<polygon transform="translate({x} {row})" points="{_SVG_SHAPES[kind]}"/>')
+        if punched and show_punched:
+            holes.add((x, row))
+    circles = [f'<circle cx="{x + 0.5}" cy="{row + 0.5}" r="{HOLE_RADIUS}"/>' for x, row in sorted(holes)]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}">'
+        f'<rect width="{size}" height="{size}" fill="white"/>'
+        f'<g fill="lightgray" fill-opacity="{layer_alpha}">{"".join(elements)}</g>'
+        f'<g fill="red">{"".join(circles)}</g>'
+        '</svg>'
+    )
+
+def write_images(items: Iterable[tuple[str, Paper, int]], directory: str, image_format: str = "png",
+                 scale: int = 32, show_punched: bool = False, layer_alpha: float = 0.5) -> list[str]:
+    # Writes one image per (name, paper, fold_index), e.g. thumbnails for a whole question bank
+    if image_format not in ("png", "svg"):
+        raise ValueError(f"Unknown image format {image_format!r}")
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, paper, fold_index in items:
+        path = os.path.join(directory, f"{name}.{image_format}")
+        if image_format == "png":
+            with open(path, "wb") as image_file:
+                image_file.write(encode_png(rasterize(paper, fold_index, scale, show_punched, layer_alpha)))
+        else:
+            with open(path, "w") as image_file:
+                image_file.write(to_svg(paper, fold_index, show_punched, layer_alpha))
+        paths.append(path)
+    return paths
@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .fold import Fold, fold_from_dict
+from .fold_cache import FoldCache
+from .generator import ALL_FOLDS
+from .paper import Paper
+from .point import Point
+
+# Local HTTP/JSON solver around Paper, so clients don't each need their own fold model.
+#
+#   python -m holepunch.service --port 8765
+#
+#   POST /solve  {"puzzles": [{"size": 4, "folds": [1, {"type": "horizontal", "line": 1.5, "downward": false}],
+#                              "punches": [[2, 2]]}, ...]}
+#   ->           {"results": [{"holes": [[[x, y], ...] per punch], "outlines": [loops per fold step]}, ...]}
+#   GET /stats   cache and coalescing counters
+#
+# Folds are indices into ALL_FOLDS or fold dicts as in a question bank, sheets are at most MAX_SIZE
+# cells across. A puzzle that can't be solved gets {"error": ...} in its slot, the rest of the batch
+# is still answered, and anything else going wrong is answered with a 500. Connections are kept alive
+# (HTTP/1.1) until the client closes them or they sit idle for keep_alive_timeout seconds.
+#
+# Solved puzzles go into an LRU result cache, and a puzzle already being solved for another request
+# is awaited instead of solved twice. Solving runs on one worker thread, which keeps the event loop
+# free for I/O and lets every puzzle share one FoldCache.
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1 << 20
+# Largest sheet a puzzle may ask for, the solver thread holds size * size cells per fold step
+MAX_SIZE = 256
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status: int = status
+
+def _fold(spec) -> Fold:
+    if isinstance(spec, dict):
+        return fold_from_dict(spec)
+    if isinstance(spec, int) and not isinstance(spec, bool) and 0 <= spec < len(ALL_FOLDS):
+        return ALL_FOLDS[spec]
+    raise ValueError(f"Fold {spec!r} is not an ALL_FOLDS index or a fold dict")
+
+def _punch(spec, size: int) -> tuple[int, int]:
+    if not isinstance(spec, list) or len(spec) != 2 or not all(isinstance(value, int) for value in spec):
+        raise ValueError(f"Punch {spec!r} is not an [x, y] pair of integers")
+    if not all(0 <= value < size for value in spec):
+        raise ValueError(f"Punch {spec!r} is outside the {size}x{size} sheet")
+    return spec[0], spec[1]
+
+def puzzle_key(puzzle) -> tuple:
+    # Hashable form of one puzzle, equal for puzzles with the same answer however their folds are written
+    if not isinstance(puzzle, dict):
+        raise ValueError("Puzzle must be a JSON object")
+    size = puzzle.get("size", 4)
+    if not isinstance(size, int) or isinstance(size, bool) or not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"Grid size {size!r} must be an integer from 1 to {MAX_SIZE}")
+    folds = tuple(_fold(spec) for spec in puzzle.get("folds", []))
+    punches = tuple(_punch(spec, size) for spec in puzzle.get("punches", []))
+    return size, tuple(fold.signature for fold in folds), punches, folds
+
+def solve(size: int, folds: tuple[Fold, ...], punches: tuple[tuple[int, int], ...], cache: FoldCache | None = None) -> dict:
+    paper = Paper(size, cache)
+    for fold in folds:
+        if not paper.check_fold_is_valid(fold):
+            raise ValueError(f"Fold {fold.to_dict()} is not valid at step {len(paper.folds) + 1}")
+        paper.add_fold(fold)
+    return {
+        "holes": [[[hole.x, hole.y] for hole in holes] for holes in paper.unfold([Point(x, y) for x, y in punches])],
+        "outlines": [[[list(vertex) for vertex in loop] for loop in paper.get_outline(step)] for step in range(len(folds) + 1)],
+    }
+
+class SolverService:
+    def __init__(self, cache_size: int = 65536, fold_cache: FoldCache | None = None, keep_alive_timeout: float = 15.0):
+        if cache_size < 1:
+            raise ValueError(f"Cache size {cache_size} must be at least 1")
+        self.cache_size: int = cache_size
+        self.fold_cache: FoldCache = fold_cache if fold_cache is not None else FoldCache()
+        self.keep_alive_timeout: float = keep_alive_timeout
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.requests: int = 0
+        self._results: OrderedDict[tuple, dict] = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="holepunch-solver")
+
+    def _cached(self, key: tuple) -> dict | None:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def _store(self, key: tuple, result: dict):
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def _solve_batch(self, puzzles: list[tuple[tuple, tuple[Fold, ...]]]) -> list[dict]:
+        results = []
+        for (size, _, punches), folds in puzzles:
+            try:
+                results.append(solve(size, folds, punches, self.fold_cache))
+            except ValueError as error:
+                results.append({"error": str(error)})
+        return results
+
+    async def solve_many(self, puzzles: list) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        results: list[dict | asyncio.Future | None] = [None] * len(puzzles)
+        pending: dict[tuple, tuple[list[int], tuple[Fold, ...]]] = {}
+        for position, puzzle in enumerate(puzzles):
+            try:
+                size, signatures, punches, folds = puzzle_key(puzzle)
+            except (ValueError, KeyError, TypeError, OverflowError) as error:
+                results[position] = {"error": str(error)}
+                continue
+            key = (size, signatures, punches)
+            cached = self._cached(key)
+            if cached is not None:
+                self.hits += 1
+                results[position] = cached
+            elif key in self._in_flight:
+                self.coalesced += 1
+                results[position] = self._in_flight[key]
+            elif key in pending:
+                # Repeated within the same batch
+                self.coalesced += 1
+                pending[key][0].append(position)
+            else:
+                self.misses += 1
+                pending[key] = ([position], folds)
+
+        if pending:
+            keys = list(pending)
+            futures = [loop.create_future() for _ in keys]
+            self._in_flight.update(zip(keys, futures))
+            for key, future in zip(keys, futures):
+                for position in pending[key][0]:
+                    results[position] = future
+            solving = loop.run_in_executor(self._executor, self._solve_batch, [(key, pending[key][1]) for key in keys])
+            # Finished from a callback rather than by this coroutine, so a client disconnecting
+            # mid-solve doesn't cancel the answer for requests that coalesced onto it
+            solving.add_done_callback(lambda done: self._finish(keys, futures, done))
+
+        # Shielded, since cancelling a task cancels the future it awaits and these are shared
+        return [await asyncio.shield(result) if isinstance(result, asyncio.Future) else result for result in results]
+
+    def _finish(self, keys: list[tuple], futures: list[asyncio.Future], solving: asyncio.Future):
+        for key in keys:
+            self._in_flight.pop(key, None)
+        error = solving.exception()
+        for key, future, result in zip(keys, futures, [None] * len(keys) if error else solving.result()):
+            if error:
+                future.set_exception(error)
+                continue
+            if "error" not in result:
+                self._store(key, result)
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "cached_results": len(self._results),
+            "fold_cache_hits": self.fold_cache.hits,
+            "fold_cache_misses": self.fold_cache.misses,
+        }
+
+    async def _route(self, method: str, path: str, body: bytes) -> dict:
+        if path == "/solve":
+            if method != "POST":
+                raise RequestError(405, "Use POST for /solve")
+            try:
+                request = json.loads(body)
+            except (UnicodeDecodeError, json.JSONDecodeError) as error:
+                raise RequestError(400, f"Body is not valid JSON: {error}")
+            if not isinstance(request, dict) or not isinstance(request.get("puzzles"), list):
+                raise RequestError(400, 'Body must be an object with a "puzzles" list')
+            return {"results": await self.solve_many(request["puzzles"])}
+        elif path == "/stats":
+            if method != "GET":
+                raise RequestError(405, "Use GET for /stats")
+            return self.stats()
+        raise RequestError(404, f"No route for {path}")
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise RequestError(413, "Request head is too large")
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = request_line.split(" ")
+        except ValueError:
+            raise RequestError(400, f"Malformed request line {request_line!r}")
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise RequestError(400, "Content-Length is not an integer")
+        if length < 0:
+            raise RequestError(400, "Content-Length must not be negative")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"Body is larger than {MAX_BODY_BYTES} bytes")
+        headers["version"] = version
+        return method, path.split("?")[0], headers, await reader.readexactly(length)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection == "keep-alive" if headers["version"] == "HTTP/1.0" else connection != "close"
+                    self.requests += 1
+                    status, payload = 200, await self._route(method, path, body)
+                except RequestError as error:
+                    # The body of a rejected request may not have been read, so the connection can't be reused
+                    status, payload, keep_alive = error.status, {"error": str(error)}, error.status not in (400, 413)
+                except Exception:
+                    logger.exception("Failed to answer a request")
+                    status, payload, keep_alive = 500, {"error": "Internal server error"}, False
+                response = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(response)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+async def serve(host: str, port: int, cache_size: int):
+    service = SolverService(cache_size)
+    server = await service.start(host, port)
+    logger.info("Serving on %s", ", ".join(str(socket.getsockname()) for socket in server.sockets))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the fold solver over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=65536, help="Solved puzzles kept in the result cache")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
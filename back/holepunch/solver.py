@@ -0,0 +1,221 @@
+import argparse
+from typing import Iterable, NamedTuple
+import numpy as np
+from .fold import Fold
+from .fold_engine import MAX_FOLDS
+from .generator import ALL_FOLDS, sheet_symmetries
+from .point import Point
+
+# The reverse of Paper: every fold sequence of up to max_depth folds, and the punch after it, whose
+# unfolded holes are exactly a target pattern.
+#
+#   python -m holepunch.solver --hole 0,0 --hole 3,0 --hole 0,3 --hole 3,3 --depth 4
+#
+# Which cells a punch goes through only depends on where every cell currently lies, and so does
+# where each fold moves them, so the search runs on cell positions alone instead of whole Papers.
+# It is a breadth-first search one fold deeper per level:
+#   - every node of a level is folded by every fold at once in NumPy, invalid folds are dropped the
+#     same way Paper.check_fold_is_valid drops them
+#   - a transposition table merges the sequences that leave the cells in the same places
+#   - symmetry pruning merges positions that are rotations or reflections of each other, for the
+#     symmetries that map both the fold set and the target onto themselves
+#   - branches are cut as soon as a cell outside the target shares a position with a target cell,
+#     since cells that are stacked stay stacked, or when the target cells are spread over more than
+#     2**(folds left) positions, since a fold at most halves that number. In particular a target of
+#     n holes needs at least log2(n) folds.
+# Solutions are read back afterwards by walking the recorded edges from the matching nodes.
+
+class Solution(NamedTuple):
+    folds: tuple[int, ...]
+    punch: Point
+
+class _Level(NamedTuple):
+    # Positions of every cell for each distinct (canonical) node, and the edges (parent node in the
+    # previous level, fold, symmetry that made the child canonical) into each node
+    positions: np.ndarray
+    edge_child: np.ndarray
+    edge_parent: np.ndarray
+    edge_fold: np.ndarray
+    edge_symmetry: np.ndarray
+
+class Solver:
+    def __init__(self, folds: list[Fold] = ALL_FOLDS, size: int = 4, chunk: int = 4096):
+        if size < 1:
+            raise ValueError(f"Grid size {size} must be at least 1")
+        self.folds: list[Fold] = folds
+        self.size: int = size
+        # Nodes expanded per NumPy batch, bounds memory at chunk * folds * cells positions
+        self.chunk: int = chunk
+        self._matrices = np.array([fold.reflection_matrix for fold in folds], dtype=np.int64)
+        self._offsets = np.array([fold.reflection_offset for fold in folds], dtype=np.int64)
+        # Same rule as FoldEngine._reflect: a cell moves when its reflection lies further left
+        # (or down) when left_fold (or downward) is set, and further right (or up) otherwise
+        self._axes = np.array([1 if fold.horizontal else 0 for fold in folds])
+        self._left = np.array([fold.left_fold for fold in folds])
+
+        y, x = np.divmod(np.arange(size * size), size)
+        self._origins = np.column_stack((x, y))
+        # (point map, cell permutation, fold permutation) of every sheet symmetry that maps the fold set onto itself
+        self.symmetries: list[tuple] = []
+        for symmetry in sheet_symmetries(size):
+            fold_permutation = self._fold_permutation(symmetry)
+            if fold_permutation is not None:
+                mapped_x, mapped_y = symmetry(x, y)
+                self.symmetries.append((symmetry, mapped_y * size + mapped_x, fold_permutation))
+
+    def _reflect(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Reflections (nodes, folds, cells, 2) of every cell by every fold, and which cells move
+        reflected = np.einsum("fij,ncj->nfci", self._matrices, positions) + self._offsets[np.newaxis, :, np.newaxis, :]
+        axes = self._axes[np.newaxis, :, np.newaxis]
+        current = np.where(axes == 1, positions[:, np.newaxis, :, 1], positions[:, np.newaxis, :, 0])
+        target = np.where(axes == 1, reflected[..., 1], reflected[..., 0])
+        moved = np.where(self._left[np.newaxis, :, np.newaxis], target < current, target > current)
+        return reflected, moved
+
+    def _fold_permutation(self, symmetry) -> np.ndarray | None:
+        # For each fold f, the fold g with g(symmetry(p)) = symmetry(f(p)) over the whole sheet, or
+        # None if some fold has no such counterpart
+        positions = self._origins[np.newaxis]
+        reflected, moved = self._reflect(positions)
+        mapped_x, mapped_y = symmetry(self._origins[:, 0], self._origins[:, 1])
+        mapped_reflected, mapped_moved = self._reflect(np.column_stack((mapped_x, mapped_y))[np.newaxis])
+        expected = np.stack(symmetry(reflected[0, ..., 0], reflected[0, ..., 1]), axis=-1)
+        permutation = []
+        for fold in range(len(self.folds)):
+            same = (mapped_reflected[0] == expected[fold]).all(axis=(1, 2)) & (mapped_moved[0] == moved[0, fold]).all(axis=1)
+            matches = np.flatnonzero(same)
+            if len(matches) == 0:
+                return None
+            permutation.append(int(matches[0]))
+        return np.array(permutation)
+
+    def _expand(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Every valid (child positions, parent, fold) of a batch of nodes
+        reflected, moved = self._reflect(positions)
+        on_sheet = ((reflected >= 0) & (reflected < self.size)).all(axis=-1)
+        valid = moved.any(axis=-1) & (on_sheet | ~moved).all(axis=-1)
+        children = np.where(moved[..., np.newaxis], reflected, positions[:, np.newaxis])
+        parents, folds = np.nonzero(valid)
+        return children[parents, folds], parents, folds
+
+    def _canonical(self, positions: np.ndarray, symmetries: list[tuple]) -> tuple[np.ndarray, np.ndarray]:
+        # Lexicographically smallest image of each node under the symmetries, and which one it was
+        best = positions.reshape(len(positions), -1)
+        chosen = np.zeros(len(positions), dtype=np.int64)
+        for index, (symmetry, cells, _) in enumerate(symmetries[1:], start=1):
+            image = np.empty_like(positions)
+            image[:, cells, 0], image[:, cells, 1] = symmetry(positions[..., 0], positions[..., 1])
+            image = image.reshape(len(positions), -1)
+            differs = image != best
+            first = differs.argmax(axis=1)
+            rows = np.arange(len(positions))
+            smaller = differs.any(axis=1) & (image[rows, first] < best[rows, first])
+            best = np.where(smaller[:, np.newaxis], image, best)
+            chosen[smaller] = index
+        return best.reshape(positions.shape), chosen
+
+    def _classify(self, positions: np.ndarray, target: np.ndarray, remaining: int) -> tuple[np.ndarray, np.ndarray]:
+        # (alive, matched): whether a node can still reach the target within `remaining` folds, and
+        # whether punching where the target cells lie produces exactly the target now
+        codes = positions[..., 1] * self.size + positions[..., 0]
+        target_codes = np.sort(codes[:, target], axis=1)
+        others = codes[:, ~target]
+        stacked = np.zeros(len(positions), dtype=bool)
+        for column in range(target_codes.shape[1]):
+            stacked |= (others == target_codes[:, column, np.newaxis]).any(axis=1)
+        spread = (np.diff(target_codes, axis=1) != 0).sum(axis=1) + 1
+        alive = ~stacked & (spread <= 2**min(remaining, MAX_FOLDS))
+        return alive, ~stacked & (spread == 1)
+
+    def solve(self, holes: Iterable[Point], max_depth: int = 4) -> list[Solution]:
+        holes = set(holes)
+        if not holes:
+            raise ValueError("Target needs at least one hole")
+        if any(not (0 <= hole.x < self.size and 0 <= hole.y < self.size) for hole in holes):
+            raise ValueError(f"Holes must lie on the {self.size}x{self.size} sheet")
+        if max_depth < 0 or max_depth >= MAX_FOLDS:
+            raise ValueError(f"Depth {max_depth} must be between 0 and {MAX_FOLDS - 1}")
+        if len(holes) > 2**max_depth:
+            return []
+        target = np.zeros(self.size * self.size, dtype=bool)
+        target[[hole.y * self.size + hole.x for hole in holes]] = True
+        # Only symmetries that keep the target in place can merge nodes
+        symmetries = [symmetry for symmetry in self.symmetries if target[symmetry[1]].tolist() == target.tolist()]
+
+        empty = np.zeros(0, dtype=np.int64)
+        levels = [_Level(self._origins[np.newaxis].astype(np.int64), empty, empty, empty, empty)]
+        matches: list[tuple[int, int, Point]] = []
+        for depth in range(max_depth + 1):
+            positions = levels[depth].positions
+            alive, matched = self._classify(positions, target, max_depth - depth)
+            first_target = int(np.flatnonzero(target)[0])
+            for node in np.flatnonzero(matched).tolist():
+                x, y = positions[node, first_target].tolist()
+                matches.append((depth, node, Point(x, y)))
+            if depth == max_depth:
+                break
+
+            children, parents, folds = [], [], []
+            expanding = np.flatnonzero(alive)
+            for start in range(0, len(expanding), self.chunk):
+                batch = expanding[start:start + self.chunk]
+                batch_children, batch_parents, batch_folds = self._expand(positions[batch])
+                keep = self._classify(batch_children, target, max_depth - depth - 1)[0]
+                children.append(batch_children[keep])
+                parents.append(batch[batch_parents[keep]])
+                folds.append(batch_folds[keep])
+            if not children or sum(len(batch) for batch in children) == 0:
+                break
+            children, chosen = self._canonical(np.concatenate(children), symmetries)
+            rows = np.ascontiguousarray(children.reshape(len(children), -1))
+            keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            levels.append(_Level(children[first], inverse.ravel(), np.concatenate(parents), np.concatenate(folds), chosen))
+
+        return self._solutions(levels, matches, symmetries)
+
+    def _solutions(self, levels: list[_Level], matches: list[tuple[int, int, Point]], symmetries: list[tuple]) -> list[Solution]:
+        edges: list[dict[int, list[tuple[int, int, int]]]] = [{}]
+        for level in levels[1:]:
+            into: dict[int, list[tuple[int, int, int]]] = {}
+            for child, parent, fold, symmetry in zip(level.edge_child.tolist(), level.edge_parent.tolist(), level.edge_fold.tolist(), level.edge_symmetry.tolist()):
+                into.setdefault(child, []).append((parent, fold, symmetry))
+            edges.append(into)
+
+        memo: dict[tuple[int, int], set[tuple[int, ...]]] = {}
+
+        def sequences(depth: int, node: int) -> set[tuple[int, ...]]:
+            # Every fold sequence from the unfolded sheet to this node, exactly
+            if depth == 0:
+                return {()}
+            if (depth, node) not in memo:
+                reached = set()
+                for parent, fold, symmetry in edges[depth][node]:
+                    permutation = symmetries[symmetry][2]
+                    for sequence in sequences(depth - 1, parent):
+                        reached.add(tuple(permutation[[*sequence, fold]].tolist()))
+                memo[(depth, node)] = reached
+            return memo[(depth, node)]
+
+        solutions = set()
+        for depth, node, punch in matches:
+            for symmetry, _, permutation in symmetries:
+                mapped_punch = Point(*symmetry(punch.x, punch.y))
+                for sequence in sequences(depth, node):
+                    solutions.add(Solution(tuple(permutation[list(sequence)].tolist()), mapped_punch))
+        return sorted(solutions, key=lambda solution: (len(solution.folds), solution.folds, solution.punch.x, solution.punch.y))
+
+def main():
+    parser = argparse.ArgumentParser(description="Find every fold sequence and punch that leaves the given holes")
+    parser.add_argument("--hole", dest="holes", action="append", required=True, help="x,y on the unfolded sheet")
+    parser.add_argument("--depth", type=int, default=4, help="Most folds to try")
+    parser.add_argument("--size", type=int, default=4)
+    args = parser.parse_args()
+    holes = [Point(*map(int, hole.split(","))) for hole in args.holes]
+    solutions = Solver(size=args.size).solve(holes, args.depth)
+    for solution in solutions:
+        print(" ".join(map(str, solution.folds)), f"punch {solution.punch.x},{solution.punch.y}")
+    print(f"{len(solutions)} solutions")
+
+if __name__ == "__main__":
+    main()